@@ -0,0 +1,50 @@
+"""transiciones y sketches
+
+Revision ID: 0b7e4d91c2a8
+Revises: f1a6b3c84e52
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4d91c2a8'
+down_revision: Union[str, Sequence[str], None] = 'f1a6b3c84e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reporte_transiciones',
+        sa.Column('id_transicion', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('id_reporte', sa.Integer(), nullable=False),
+        sa.Column('id_estado_anterior', sa.Integer(), nullable=True),
+        sa.Column('id_estado_nuevo', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['id_reporte'], ['reportes.id_reporte'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_transicion')
+    )
+    op.create_index(
+        'ix_reporte_transiciones_reporte_fecha', 'reporte_transiciones',
+        ['id_reporte', 'created_at'], unique=False
+    )
+    op.create_table(
+        'sketches',
+        sa.Column('ambito', sa.String(length=50), nullable=False),
+        sa.Column('clave', sa.String(length=50), nullable=False),
+        sa.Column('datos', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('ambito', 'clave')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sketches')
+    op.drop_index('ix_reporte_transiciones_reporte_fecha', table_name='reporte_transiciones')
+    op.drop_table('reporte_transiciones')
@@ -0,0 +1,28 @@
+"""indice paginacion reportes
+
+Revision ID: 3b9d2c71e4a5
+Revises: 87f019df8236
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2c71e4a5'
+down_revision: Union[str, Sequence[str], None] = '87f019df8236'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reportes_created_at_id', 'reportes', ['created_at', 'id_reporte'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reportes_created_at_id', table_name='reportes')
@@ -0,0 +1,48 @@
+"""categoria departamento
+
+Revision ID: 5c2d8e61f0b3
+Revises: 0b7e4d91c2a8
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from sirse_api.catalogos import MAPEO_DEPARTAMENTOS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d8e61f0b3'
+down_revision: Union[str, Sequence[str], None] = '0b7e4d91c2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'categoria_departamento',
+        sa.Column('id_departamento', sa.Integer(), nullable=False),
+        sa.Column('id_categoria', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['id_departamento'], ['departamentos.id_departamento'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['id_categoria'], ['categorias.id_categoria'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id_departamento', 'id_categoria')
+    )
+
+    # La misma asignación que seed_data.py; solo para departamentos y categorías que ya existen
+    for departamento, categorias in MAPEO_DEPARTAMENTOS.items():
+        op.get_bind().execute(
+            sa.text(
+                "INSERT INTO categoria_departamento (id_departamento, id_categoria) "
+                "SELECT d.id_departamento, c.id_categoria FROM departamentos d, categorias c "
+                "WHERE d.nombre = :departamento AND c.nombre IN :categorias"
+            ).bindparams(sa.bindparam('categorias', expanding=True)),
+            {"departamento": departamento, "categorias": categorias}
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('categoria_departamento')
@@ -0,0 +1,34 @@
+"""secuencia folios
+
+Revision ID: 5e1f8a2b9c3d
+Revises: 3b9d2c71e4a5
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f8a2b9c3d'
+down_revision: Union[str, Sequence[str], None] = '3b9d2c71e4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    folio_secuencias = op.create_table(
+        'folio_secuencias',
+        sa.Column('nombre', sa.String(length=50), nullable=False),
+        sa.Column('siguiente', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('nombre')
+    )
+    op.bulk_insert(folio_secuencias, [{'nombre': 'reportes', 'siguiente': 1}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('folio_secuencias')
@@ -0,0 +1,74 @@
+"""coordenadas numericas
+
+Revision ID: 8c4a6d0e2f17
+Revises: 5e1f8a2b9c3d
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4a6d0e2f17'
+down_revision: Union[str, Sequence[str], None] = '5e1f8a2b9c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOTE = 1000
+
+
+def _a_float(valor):
+    try:
+        numero = float(str(valor).strip())
+    except (TypeError, ValueError):
+        return None
+    return numero if math.isfinite(numero) else None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reportes', sa.Column('latitud_num', sa.Float(), nullable=True))
+    op.add_column('reportes', sa.Column('longitud_num', sa.Float(), nullable=True))
+
+    # Backfill: las coordenadas de texto pueden traer basura, se convierten en Python
+    reportes = sa.table(
+        'reportes',
+        sa.column('id_reporte', sa.Integer),
+        sa.column('latitud', sa.String),
+        sa.column('longitud', sa.String),
+        sa.column('latitud_num', sa.Float),
+        sa.column('longitud_num', sa.Float),
+    )
+    conn = op.get_bind()
+    actualizar = reportes.update().where(
+        reportes.c.id_reporte == sa.bindparam('_id')
+    ).values(latitud_num=sa.bindparam('_lat'), longitud_num=sa.bindparam('_lon'))
+
+    ultimo = 0
+    while True:
+        filas = conn.execute(
+            sa.select(reportes.c.id_reporte, reportes.c.latitud, reportes.c.longitud)
+            .where(reportes.c.id_reporte > ultimo)
+            .order_by(reportes.c.id_reporte)
+            .limit(LOTE)
+        ).all()
+        if not filas:
+            break
+        conn.execute(actualizar, [
+            {'_id': id_reporte, '_lat': _a_float(latitud), '_lon': _a_float(longitud)}
+            for id_reporte, latitud, longitud in filas
+        ])
+        ultimo = filas[-1].id_reporte
+
+    op.create_index('ix_reportes_coordenadas', 'reportes', ['longitud_num', 'latitud_num'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reportes_coordenadas', table_name='reportes')
+    op.drop_column('reportes', 'longitud_num')
+    op.drop_column('reportes', 'latitud_num')
@@ -0,0 +1,63 @@
+"""geohash reportes
+
+Revision ID: a2d7e9b14c60
+Revises: 8c4a6d0e2f17
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from sirse_api.geohash import codificar
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d7e9b14c60'
+down_revision: Union[str, Sequence[str], None] = '8c4a6d0e2f17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOTE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reportes', sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    reportes = sa.table(
+        'reportes',
+        sa.column('id_reporte', sa.Integer),
+        sa.column('latitud_num', sa.Float),
+        sa.column('longitud_num', sa.Float),
+        sa.column('geohash', sa.String),
+    )
+    conn = op.get_bind()
+    actualizar = reportes.update().where(
+        reportes.c.id_reporte == sa.bindparam('_id')
+    ).values(geohash=sa.bindparam('_geohash'))
+
+    ultimo = 0
+    while True:
+        filas = conn.execute(
+            sa.select(reportes.c.id_reporte, reportes.c.latitud_num, reportes.c.longitud_num)
+            .where(reportes.c.id_reporte > ultimo)
+            .order_by(reportes.c.id_reporte)
+            .limit(LOTE)
+        ).all()
+        if not filas:
+            break
+        conn.execute(actualizar, [
+            {'_id': id_reporte, '_geohash': codificar(latitud, longitud)}
+            for id_reporte, latitud, longitud in filas
+        ])
+        ultimo = filas[-1].id_reporte
+
+    op.create_index(op.f('ix_reportes_geohash'), 'reportes', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reportes_geohash'), table_name='reportes')
+    op.drop_column('reportes', 'geohash')
@@ -0,0 +1,29 @@
+"""busqueda texto reportes
+
+Revision ID: c61b0f3a8d92
+Revises: a2d7e9b14c60
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from sirse_api import busqueda
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61b0f3a8d92'
+down_revision: Union[str, Sequence[str], None] = 'a2d7e9b14c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    busqueda.crear_indice(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    busqueda.borrar_indice(op.get_bind())
@@ -0,0 +1,37 @@
+"""duplicados reportes
+
+Revision ID: d84e2a6c1b37
+Revises: c61b0f3a8d92
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84e2a6c1b37'
+down_revision: Union[str, Sequence[str], None] = 'c61b0f3a8d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reportes', sa.Column('duplicado_de', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_reportes_duplicado_de', 'reportes', 'reportes',
+        ['duplicado_de'], ['id_reporte'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_reportes_duplicado_de'), 'reportes', ['duplicado_de'], unique=False)
+    op.create_index('ix_reportes_categoria_fecha', 'reportes', ['id_categoria', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reportes_categoria_fecha', table_name='reportes')
+    op.drop_index(op.f('ix_reportes_duplicado_de'), table_name='reportes')
+    op.drop_constraint('fk_reportes_duplicado_de', 'reportes', type_='foreignkey')
+    op.drop_column('reportes', 'duplicado_de')
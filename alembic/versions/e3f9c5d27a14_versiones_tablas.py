@@ -0,0 +1,37 @@
+"""versiones tablas
+
+Revision ID: e3f9c5d27a14
+Revises: d84e2a6c1b37
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f9c5d27a14'
+down_revision: Union[str, Sequence[str], None] = 'd84e2a6c1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    versiones_tablas = op.create_table(
+        'versiones_tablas',
+        sa.Column('nombre', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('nombre')
+    )
+    op.bulk_insert(versiones_tablas, [
+        {'nombre': 'reportes', 'version': 1},
+        {'nombre': 'catalogos', 'version': 1},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('versiones_tablas')
@@ -0,0 +1,38 @@
+"""reporte stats daily
+
+Revision ID: f1a6b3c84e52
+Revises: e3f9c5d27a14
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from sirse_api.estadisticas_diarias import reconstruir
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a6b3c84e52'
+down_revision: Union[str, Sequence[str], None] = 'e3f9c5d27a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reporte_stats_daily',
+        sa.Column('dia', sa.Date(), nullable=False),
+        sa.Column('id_categoria', sa.Integer(), nullable=False),
+        sa.Column('id_estado', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dia', 'id_categoria', 'id_estado')
+    )
+    reconstruir(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reporte_stats_daily')
@@ -1,32 +1,63 @@
-// Cargar estadísticas del dashboard
+// Últimas métricas mostradas (base para aplicar los deltas del stream)
+let metricasActuales = {};
+
+// Si los gráficos ya se dibujaron con datos del servidor
+let graficosCargados = false;
+
+// Cargar estadísticas del dashboard (cards y gráficos en una sola petición)
 async function cargarEstadisticas() {
     try {
-        const response = await apiRequest('/estadisticas/generales');
+        const response = await apiRequest('/estadisticas/dashboard');
         
         if (response && response.ok) {
             const data = await response.json();
             
             console.log('Datos recibidos:', data);
+            console.log('⏱️ Tiempos por panel (ms):', data.tiempos_ms);
             
-            // Actualizar cards
-            document.getElementById('total-reportes').textContent = data.total_reportes || 0;
-            document.getElementById('reportes-atendidos').textContent = data.reportes_resueltos || 0;
-            document.getElementById('reportes-pendientes').textContent = data.reportes_pendientes || 0;
-            document.getElementById('falsos-positivos').textContent = '0'; // Por ahora fijo
-
-            // Cargar gráficos
-            cargarGraficos();
+            if (data.generales) {
+                mostrarMetricas(data.generales);
+            } else {
+                mostrarDatosPorDefecto();
+            }
+
+            // Gráficos (con datos de ejemplo si el panel falló)
+            crearGraficoMes(data.por_mes_chart);
+            crearGraficoCategoria(data.por_categoria_chart);
+            graficosCargados = true;
             
         } else {
             console.error('Error cargando estadísticas:', response?.status);
             mostrarDatosPorDefecto();
+            crearGraficoMes();
+            crearGraficoCategoria();
         }
     } catch (error) {
         console.error('Error cargando estadísticas:', error);
         mostrarDatosPorDefecto();
+        crearGraficoMes();
+        crearGraficoCategoria();
     }
 }
 
+// Actualizar cards
+function mostrarMetricas(data) {
+    metricasActuales = { ...data };
+    document.getElementById('total-reportes').textContent = data.total_reportes || 0;
+    document.getElementById('reportes-atendidos').textContent = data.reportes_resueltos || 0;
+    document.getElementById('reportes-pendientes').textContent = data.reportes_pendientes || 0;
+    document.getElementById('falsos-positivos').textContent = '0'; // Por ahora fijo
+}
+
+// Sumar los cambios recibidos por el stream a las métricas actuales
+function aplicarDeltas(deltas) {
+    const data = { ...metricasActuales };
+    for (const [metrica, cambio] of Object.entries(deltas)) {
+        data[metrica] = (data[metrica] || 0) + cambio;
+    }
+    mostrarMetricas(data);
+}
+
 // Mostrar datos por defecto si hay error
 function mostrarDatosPorDefecto() {
     document.getElementById('total-reportes').textContent = '0';
@@ -35,50 +66,6 @@ function mostrarDatosPorDefecto() {
     document.getElementById('falsos-positivos').textContent = '0';
 }
 
-// Cargar gráficos
-async function cargarGraficos() {
-    console.log('🔍 Iniciando carga de gráficos...');
-    
-    try {
-        // Gráfico por mes
-        console.log('📊 Llamando a /estadisticas/por-mes-chart...');
-        const responseMes = await apiRequest('/estadisticas/por-mes-chart');
-        
-        if (responseMes && responseMes.ok) {
-            const datosMes = await responseMes.json();
-            console.log('📈 Datos mes recibidos:', datosMes);
-            crearGraficoMes(datosMes);
-        } else {
-            console.error('❌ Error cargando gráfico por mes, status:', responseMes?.status);
-            crearGraficoMes({
-                labels: ["Ene", "Feb", "Mar", "Abr", "May", "Jun"],
-                values: [5, 8, 12, 6, 9, 15]
-            });
-        }
-        
-        // Gráfico por categoría
-        console.log('📊 Llamando a /estadisticas/por-categoria-chart...');
-        const responseCategoria = await apiRequest('/estadisticas/por-categoria-chart');
-        
-        if (responseCategoria && responseCategoria.ok) {
-            const datosCategoria = await responseCategoria.json();
-            console.log('📊 Datos categoría recibidos:', datosCategoria);
-            crearGraficoCategoria(datosCategoria);
-        } else {
-            console.error('❌ Error cargando gráfico por categoría, status:', responseCategoria?.status);
-            crearGraficoCategoria({
-                labels: ["Seguridad", "Robo", "Accidente", "Vandalismo", "Alumbrado"],
-                values: [8, 5, 3, 2, 4]
-            });
-        }
-        
-    } catch (error) {
-        console.error('💥 Error cargando gráficos:', error);
-        crearGraficoMes();
-        crearGraficoCategoria();
-    }
-}
-
 //
 // ==========================
 //   GRÁFICOS ESTABILIZADOS
@@ -233,23 +220,94 @@ async function apiRequest(endpoint, options = {}) {
     }
 }
 
-// Actualizar datos cada 30 segundos
-function iniciarActualizacionAutomatica() {
-    setInterval(() => {
+//
+// ==========================
+//   ACTUALIZACIÓN EN VIVO
+// ==========================
+//
+
+let fuenteEventos = null;
+let intervaloSondeo = null;
+let recargaGraficos = null;
+
+// Los gráficos se recargan como máximo una vez por ventana, no con cada cambio
+const ESPERA_RECARGA_GRAFICOS = 30000;
+
+function programarRecargaGraficos() {
+    if (recargaGraficos) return;
+    // Con variación para que las pestañas abiertas no pidan todas al mismo tiempo
+    const espera = ESPERA_RECARGA_GRAFICOS * (1 + Math.random() / 2);
+    recargaGraficos = setTimeout(() => {
+        recargaGraficos = null;
+        cargarEstadisticas();
+    }, espera);
+}
+
+// Respaldo: volver a pedir las estadísticas cada 30 segundos
+function iniciarSondeo() {
+    if (intervaloSondeo) return;
+    console.log('⏱️ Sin stream de métricas, actualizando cada 30 segundos');
+    intervaloSondeo = setInterval(() => {
         cargarEstadisticas();
     }, 30000);
 }
 
+function detenerSondeo() {
+    if (intervaloSondeo) {
+        clearInterval(intervaloSondeo);
+        intervaloSondeo = null;
+    }
+}
+
+// Suscribirse a /estadisticas/stream: el servidor envía las métricas solo
+// cuando hay altas, cambios de estado o bajas de reportes
+function iniciarActualizacionAutomatica() {
+    const token = localStorage.getItem('token');
+    if (!window.EventSource || !token) {
+        iniciarSondeo();
+        return;
+    }
+
+    fuenteEventos = new EventSource(`${API_URL}/estadisticas/stream?token=${encodeURIComponent(token)}`);
+
+    // Foto completa: al conectar y cuando otro servidor registró cambios.
+    // Las cards se actualizan con la foto; los gráficos, solo al inicio o en diferido
+    fuenteEventos.addEventListener('metricas', (evento) => {
+        detenerSondeo();
+        mostrarMetricas(JSON.parse(evento.data));
+        if (graficosCargados) {
+            programarRecargaGraficos();
+        } else {
+            cargarEstadisticas();
+        }
+    });
+
+    fuenteEventos.addEventListener('delta', (evento) => {
+        aplicarDeltas(JSON.parse(evento.data));
+        programarRecargaGraficos();
+    });
+
+    // EventSource reintenta solo; mientras tanto (o si el servidor lo rechaza) se sondea
+    fuenteEventos.onerror = () => {
+        if (fuenteEventos.readyState === EventSource.CLOSED) {
+            fuenteEventos = null;
+        }
+        iniciarSondeo();
+    };
+}
+
 // Cargar datos al iniciar
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Dashboard cargado - Iniciando carga de datos...');
-    cargarEstadisticas();
     iniciarActualizacionAutomatica();
+    if (!fuenteEventos) {
+        cargarEstadisticas();
+    }
 });
 
-// Recargar datos cuando la página vuelve a ser visible
+// Recargar datos cuando la página vuelve a ser visible (con el stream ya están al día)
 document.addEventListener('visibilitychange', function() {
-    if (!document.hidden) {
+    if (!document.hidden && !fuenteEventos) {
         cargarEstadisticas();
     }
 });
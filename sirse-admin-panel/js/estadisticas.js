@@ -33,7 +33,8 @@ async function loadEstadisticas() {
         const stats = await statsResponse.json();
 
         document.getElementById('tasa-resolucion').textContent = `${stats.tasa_resolucion}%`;
-        document.getElementById('tiempo-respuesta').textContent = `${stats.tiempo_respuesta}h`;
+        document.getElementById('tiempo-respuesta').textContent =
+            stats.tiempo_respuesta == null ? '—' : `${stats.tiempo_respuesta}h`;
         document.getElementById('satisfaccion').textContent = `${stats.satisfaccion}/5`;
         document.getElementById('reportes-mes').textContent = stats.reportes_mes_actual;
 
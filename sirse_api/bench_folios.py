@@ -0,0 +1,47 @@
+"""
+Benchmark de concurrencia del asignador de folios.
+Lanza varios procesos que generan folios contra la BD configurada
+y verifica que ninguno se repita.
+Ejecutar con: python -m sirse_api.bench_folios --procesos 8 --folios 5000
+"""
+import argparse
+import multiprocessing
+import time
+
+
+def _generar(cantidad):
+    from .folios import generar_folio
+    return [generar_folio() for _ in range(cantidad)]
+
+
+def ejecutar(procesos: int, folios: int):
+    from . import models  # noqa: F401 (registra las tablas)
+    from .database import Base, engine
+    Base.metadata.create_all(bind=engine)
+
+    # spawn: cada proceso abre su propio pool de conexiones
+    contexto = multiprocessing.get_context("spawn")
+    inicio = time.perf_counter()
+    with contexto.Pool(procesos) as pool:
+        lotes = pool.map(_generar, [folios] * procesos)
+    duracion = time.perf_counter() - inicio
+
+    generados = [folio for lote in lotes for folio in lote]
+    numeros = {folio.split("-")[2] for folio in generados}
+    repetidos = len(generados) - len(numeros)
+
+    print("=" * 50)
+    print(f"📋 Procesos: {procesos}")
+    print(f"🔢 Folios generados: {len(generados)}")
+    print(f"⏱️  Tiempo: {duracion:.2f} s ({len(generados) / duracion:,.0f} folios/s)")
+    print(f"{'✅' if repetidos == 0 else '❌'} Repetidos: {repetidos}")
+    print("=" * 50)
+    return repetidos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--procesos", type=int, default=8)
+    parser.add_argument("--folios", type=int, default=5000)
+    args = parser.parse_args()
+    raise SystemExit(1 if ejecutar(args.procesos, args.folios) else 0)
@@ -0,0 +1,210 @@
+"""
+Benchmark del tamaño y tiempo de serialización de las respuestas de reportes.
+Para GET /api/reportes/ compara el listado completo (List[ReporteResponse] con
+categoría, estado y multimedia, por el mismo camino que sigue FastAPI con
+response_model) contra el formato columnar y contra `fields=`, sin y con gzip.
+Para el mapa compara la lista de ReporteSimple contra el formato columnar,
+y el codificador json estándar contra orjson.
+No requiere base de datos: usa filas y objetos sintéticos.
+Ejecutar con: python -m sirse_api.bench_payloads --filas 100 1000 10000
+"""
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+
+from . import models
+from .formatos import RespuestaJSON, orjson, serializar_columnar
+from .routers.reportes import COLUMNAS_REPORTE, parsear_campos, respuesta_campos, router
+from .schemas import ReporteSimple
+
+COLUMNAS = list(ReporteSimple.model_fields)
+CAMPOS = "folio,id_estado,created_at"
+
+
+def generar_filas(cantidad: int):
+    inicio = datetime(2025, 1, 1, 8, 0, 0)
+    return [
+        (
+            i,
+            "Juan",
+            "Pérez",
+            "López",
+            f"SIRSE-20250101-{i:07d}-AB12",
+            "Poste de alumbrado caído sobre la banqueta",
+            f"{20.08 + i * 1e-5:.6f}",
+            f"{-98.36 - i * 1e-5:.6f}",
+            f"Av. Juárez #{i % 500}",
+            inicio + timedelta(minutes=i),
+        )
+        for i in range(cantidad)
+    ]
+
+
+def generar_reportes(cantidad: int):
+    """Reportes ORM sin sesión, con categoría, estado y 0-2 archivos multimedia cada uno"""
+    inicio = datetime(2025, 1, 1, 8, 0, 0)
+    categorias = [
+        models.Categoria(id_categoria=i, nombre=nombre, descripcion=f"Reportes de {nombre.lower()}",
+                         estado=True, created_at=inicio)
+        for i, nombre in enumerate(("Baches", "Basura", "Alumbrado público"), start=1)
+    ]
+    estados = [
+        models.Estado(id_estado=i, nombre=nombre, descripcion=None, activo=True, created_at=inicio)
+        for i, nombre in enumerate(("Pendiente", "En proceso", "Resuelto"), start=1)
+    ]
+    reportes = []
+    for i in range(cantidad):
+        fecha = inicio + timedelta(minutes=i)
+        categoria, estado = categorias[i % 3], estados[i % 3]
+        reporte = models.Reporte(
+            id_reporte=i,
+            folio=f"SIRSE-20250101-{i:07d}-AB12",
+            nombre="Juan",
+            apellido_paterno="Pérez",
+            apellido_materno="López",
+            telefono_reportante="7711234567",
+            descripcion="Poste de alumbrado caído sobre la banqueta",
+            latitud=f"{20.08 + i * 1e-5:.6f}",
+            longitud=f"{-98.36 - i * 1e-5:.6f}",
+            direccion=f"Av. Juárez #{i % 500}",
+            id_categoria=categoria.id_categoria,
+            id_estado=estado.id_estado,
+            duplicado_de=None,
+            created_at=fecha,
+            updated_at=fecha,
+        )
+        # Se asignan en __dict__ para no llenar categoria.reportes/estado.reportes
+        reporte.__dict__["categoria"] = categoria
+        reporte.__dict__["estado"] = estado
+        reporte.__dict__["multimedia"] = [
+            models.Multimedia(id_multimedia=i * 2 + j, id_reporte=i, tipo_archivo="image/jpeg",
+                              url_archivo=f"/static/uploads/{i}_{j}.jpg", created_at=fecha)
+            for j in range(i % 3)
+        ]
+        reportes.append(reporte)
+    return reportes
+
+
+def _ruta(path: str):
+    return next(r for r in router.routes if r.path == path and "GET" in r.methods)
+
+
+def serializar_response_model(ruta, contenido):
+    # Mismo camino que fastapi.routing.serialize_response: validación con
+    # from_attributes y volcado a bytes con pydantic (dump_json), porque la ruta
+    # usa la clase de respuesta por omisión; orjson no interviene
+    valor, errores = ruta.response_field.validate(contenido, {}, loc=("response",))
+    if errores:
+        raise ValueError(errores)
+    return ruta.response_field.serialize_json(valor, by_alias=True)
+
+
+def listado_response_model(reportes):
+    return serializar_response_model(_ruta("/reportes/"), reportes)
+
+
+def listado_columnar(filas):
+    return serializar_columnar([c.key for c in COLUMNAS_REPORTE], filas)
+
+
+def listado_campos(filas, request):
+    return respuesta_campos(request, parsear_campos(CAMPOS), filas).body
+
+
+def _medir(funcion, repeticiones: int):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return resultado, (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def formato_actual(objetos):
+    return serializar_response_model(_ruta("/reportes/mapa/puntos"), objetos)
+
+
+def formato_columnar(filas):
+    return serializar_columnar(COLUMNAS, filas)
+
+
+def codificar_json(contenido):
+    return json.dumps(contenido, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def codificar_orjson(contenido):
+    return RespuestaJSON(contenido).body
+
+
+def comparar_codificadores(tamaños, repeticiones: int, nivel_gzip: int):
+    if orjson is None:
+        print("orjson no está instalado; se omite la comparación de codificadores")
+        return
+    print("=" * 72)
+    print(f"{'Filas':>8} | {'Codificador':<11} | {'ms':>9} | {'Bytes':>12} | {'gzip':>10} | {'ms gzip':>8}")
+    print("-" * 72)
+    for cantidad in tamaños:
+        contenido = [dict(zip(COLUMNAS, fila)) for fila in jsonable_encoder(generar_filas(cantidad))]
+        for nombre, funcion in (("json", codificar_json), ("orjson", codificar_orjson)):
+            cuerpo, ms = _medir(lambda: funcion(contenido), repeticiones)
+            comprimido, ms_gzip = _medir(lambda: gzip.compress(cuerpo, nivel_gzip), repeticiones)
+            print(f"{cantidad:>8} | {nombre:<11} | {ms:>9.2f} | {len(cuerpo):>12,} | "
+                  f"{len(comprimido):>10,} | {ms_gzip:>8.2f}")
+    print("=" * 72)
+
+
+def comparar_listado(tamaños, repeticiones: int, nivel_gzip: int):
+    ruta = _ruta("/reportes/")
+    if not isinstance(ruta.response_class, DefaultPlaceholder):
+        print("Aviso: listar_reportes ya no usa la clase de respuesta por omisión; "
+              "FastAPI no serializa con dump_json")
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    print("=" * 80)
+    print(f"{'Reportes':>8} | {'Listado':<16} | {'ms':>9} | {'Bytes':>12} | {'gzip':>10} | {'vs completo':>11}")
+    print("-" * 80)
+    for cantidad in tamaños:
+        reportes = generar_reportes(cantidad)
+        filas = [tuple(getattr(r, c.key) for c in COLUMNAS_REPORTE) for r in reportes]
+        completo = None
+        for nombre, funcion in (
+            ("response_model", lambda: listado_response_model(reportes)),
+            ("columnar", lambda: listado_columnar(filas)),
+            (f"fields={len(CAMPOS.split(','))}", lambda: listado_campos(filas, request)),
+        ):
+            cuerpo, ms = _medir(funcion, repeticiones)
+            completo = completo or len(cuerpo)
+            comprimido = gzip.compress(cuerpo, nivel_gzip)
+            print(f"{cantidad:>8} | {nombre:<16} | {ms:>9.2f} | {len(cuerpo):>12,} | "
+                  f"{len(comprimido):>10,} | {len(cuerpo) / completo:>10.0%}")
+    print("=" * 80)
+
+
+def ejecutar(tamaños, repeticiones: int):
+    print("=" * 72)
+    print(f"{'Filas':>8} | {'Formato':<9} | {'Bytes':>12} | {'ms':>9} | {'Bytes vs actual':>15}")
+    print("-" * 72)
+    for cantidad in tamaños:
+        filas = generar_filas(cantidad)
+        objetos = [SimpleNamespace(**dict(zip(COLUMNAS, fila))) for fila in filas]
+        actual, ms_actual = _medir(lambda: formato_actual(objetos), repeticiones)
+        columnar, ms_columnar = _medir(lambda: formato_columnar(filas), repeticiones)
+        print(f"{cantidad:>8} | {'actual':<9} | {len(actual):>12,} | {ms_actual:>9.2f} | {'100%':>15}")
+        print(f"{cantidad:>8} | {'columnar':<9} | {len(columnar):>12,} | {ms_columnar:>9.2f} | "
+              f"{len(columnar) / len(actual):>14.0%}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--nivel-gzip", type=int, default=6)
+    args = parser.parse_args()
+    comparar_listado(args.filas, args.repeticiones, args.nivel_gzip)
+    ejecutar(args.filas, args.repeticiones)
+    comparar_codificadores(args.filas, args.repeticiones, args.nivel_gzip)
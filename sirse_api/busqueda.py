@@ -0,0 +1,132 @@
+"""
+Búsqueda de texto completo sobre la descripción y dirección de los reportes.
+
+Cada motor usa su propio índice:
+- PostgreSQL (Vercel): índice GIN sobre to_tsvector('spanish', ...), rango con ts_rank.
+- MySQL (local): índice FULLTEXT con MATCH ... AGAINST.
+- SQLite (desarrollo): tabla virtual FTS5 `reportes_fts` sincronizada por triggers, rango bm25.
+"""
+from sqlalchemy import text
+
+from . import models
+
+INDICE_POSTGRES = "ix_reportes_busqueda"
+INDICE_MYSQL = "ft_reportes_busqueda"
+
+DOCUMENTO_POSTGRES = (
+    "to_tsvector('spanish', coalesce(descripcion, '') || ' ' || coalesce(direccion, ''))"
+)
+
+TRIGGERS_SQLITE = {
+    "reportes_fts_ai": """
+        CREATE TRIGGER IF NOT EXISTS reportes_fts_ai AFTER INSERT ON reportes BEGIN
+            INSERT INTO reportes_fts(rowid, descripcion, direccion)
+            VALUES (new.id_reporte, new.descripcion, new.direccion);
+        END""",
+    "reportes_fts_ad": """
+        CREATE TRIGGER IF NOT EXISTS reportes_fts_ad AFTER DELETE ON reportes BEGIN
+            INSERT INTO reportes_fts(reportes_fts, rowid, descripcion, direccion)
+            VALUES ('delete', old.id_reporte, old.descripcion, old.direccion);
+        END""",
+    "reportes_fts_au": """
+        CREATE TRIGGER IF NOT EXISTS reportes_fts_au AFTER UPDATE OF descripcion, direccion ON reportes BEGIN
+            INSERT INTO reportes_fts(reportes_fts, rowid, descripcion, direccion)
+            VALUES ('delete', old.id_reporte, old.descripcion, old.direccion);
+            INSERT INTO reportes_fts(rowid, descripcion, direccion)
+            VALUES (new.id_reporte, new.descripcion, new.direccion);
+        END""",
+}
+
+
+def crear_indice(conn):
+    """Crea el índice de texto del motor en uso si aún no existe"""
+    motor = conn.dialect.name
+
+    if motor == "postgresql":
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {INDICE_POSTGRES} ON reportes USING gin ({DOCUMENTO_POSTGRES})"
+        ))
+
+    elif motor == "mysql":
+        existe = conn.execute(text(
+            "SELECT COUNT(*) FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'reportes' AND index_name = :indice"
+        ), {"indice": INDICE_MYSQL}).scalar()
+        if not existe:
+            conn.execute(text(
+                f"ALTER TABLE reportes ADD FULLTEXT INDEX {INDICE_MYSQL} (descripcion, direccion)"
+            ))
+
+    elif motor == "sqlite":
+        existe = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reportes_fts'"
+        )).first()
+        if not existe:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE reportes_fts USING fts5("
+                "descripcion, direccion, content='reportes', content_rowid='id_reporte', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            ))
+            conn.execute(text("INSERT INTO reportes_fts(reportes_fts) VALUES ('rebuild')"))
+        for ddl in TRIGGERS_SQLITE.values():
+            conn.execute(text(ddl))
+
+
+def borrar_indice(conn):
+    """Elimina el índice creado por crear_indice"""
+    motor = conn.dialect.name
+
+    if motor == "postgresql":
+        conn.execute(text(f"DROP INDEX IF EXISTS {INDICE_POSTGRES}"))
+    elif motor == "mysql":
+        conn.execute(text(f"ALTER TABLE reportes DROP INDEX {INDICE_MYSQL}"))
+    elif motor == "sqlite":
+        for trigger in TRIGGERS_SQLITE:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text("DROP TABLE IF EXISTS reportes_fts"))
+
+
+def _consulta_fts5(q: str) -> str:
+    """Escapa cada término como frase para que la sintaxis de FTS5 no se interprete"""
+    return " ".join('"' + termino.replace('"', '""') + '"' for termino in q.split())
+
+
+def buscar(db, q: str, skip: int = 0, limit: int = 20) -> list:
+    """Devuelve los id_reporte que coinciden con `q`, del más al menos relevante"""
+    motor = db.get_bind().dialect.name
+    parametros = {"q": q, "skip": skip, "limit": limit}
+
+    if motor == "postgresql":
+        sql = f"""
+            SELECT id_reporte, ts_rank({DOCUMENTO_POSTGRES}, consulta) AS rango
+            FROM reportes, websearch_to_tsquery('spanish', :q) AS consulta
+            WHERE {DOCUMENTO_POSTGRES} @@ consulta
+            ORDER BY rango DESC, id_reporte DESC
+            LIMIT :limit OFFSET :skip"""
+
+    elif motor == "mysql":
+        sql = """
+            SELECT id_reporte, MATCH (descripcion, direccion) AGAINST (:q IN NATURAL LANGUAGE MODE) AS rango
+            FROM reportes
+            WHERE MATCH (descripcion, direccion) AGAINST (:q IN NATURAL LANGUAGE MODE)
+            ORDER BY rango DESC, id_reporte DESC
+            LIMIT :limit OFFSET :skip"""
+
+    elif motor == "sqlite":
+        parametros["q"] = _consulta_fts5(q)
+        sql = """
+            SELECT rowid AS id_reporte, bm25(reportes_fts) AS rango
+            FROM reportes_fts
+            WHERE reportes_fts MATCH :q
+            ORDER BY rango, rowid DESC
+            LIMIT :limit OFFSET :skip"""
+
+    else:
+        patron = f"%{q}%"
+        return [
+            id_reporte for (id_reporte,) in db.query(models.Reporte.id_reporte).filter(
+                models.Reporte.descripcion.ilike(patron) | models.Reporte.direccion.ilike(patron)
+            ).order_by(models.Reporte.id_reporte.desc()).offset(skip).limit(limit)
+        ]
+
+    return [fila.id_reporte for fila in db.execute(text(sql), parametros)]
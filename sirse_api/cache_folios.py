@@ -0,0 +1,202 @@
+"""
+Caché de las respuestas de /reportes/folio/{folio}.
+
+Es el endpoint público de seguimiento que los ciudadanos consultan una y
+otra vez después de levantar su reporte. Se guarda el JSON ya serializado
+junto con su ETag, así que un acierto responde (o da 304) sin tocar la BD.
+
+El almacén es intercambiable (CACHE_FOLIOS_BACKEND):
+  - "memoria": LRU por proceso; cada worker tiene su propia copia.
+  - "sqlite": un archivo local compartido por todos los workers de la
+    máquina, de modo que una invalidación se ve en todos.
+Los handlers que modifican un reporte llaman a `invalidar(folio, version)`;
+el TTL acota lo que puede durar una copia vieja en cualquier caso.
+
+Cada entrada lleva la versión de reportes (versiones_tablas) leída en la
+misma consulta que la fila, y un almacén nunca reemplaza una entrada vigente
+por otra de versión anterior. Al invalidar se deja una lápida con la versión
+ya confirmada: una lectura que cargó la fila antes del cambio y llega tarde
+a guardar se descarta en lugar de volver a poner la copia vieja.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_FOLIOS_BACKEND = os.getenv("CACHE_FOLIOS_BACKEND", "memoria")
+CACHE_FOLIOS_MAXIMO = int(os.getenv("CACHE_FOLIOS_MAXIMO", "5000"))
+CACHE_FOLIOS_TTL = int(os.getenv("CACHE_FOLIOS_TTL", "60"))
+CACHE_FOLIOS_RUTA = os.getenv(
+    "CACHE_FOLIOS_RUTA", os.path.join(tempfile.gettempdir(), "sirse_cache_folios.db")
+)
+
+
+# ========= ALMACENES =========
+
+class AlmacenMemoria:
+    """LRU con expiración en un OrderedDict (el más reciente al final)"""
+
+    def __init__(self, maximo: int):
+        self.maximo = maximo
+        self._datos = OrderedDict()  # clave -> (expira, version, valor)
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            if entrada[0] <= time.time():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return entrada[1], entrada[2]
+
+    def guardar(self, clave: str, valor: bytes, version: int, ttl: int):
+        ahora = time.time()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada and entrada[0] > ahora and entrada[1] > version:
+                return
+            self._datos[clave] = (ahora + ttl, version, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def total(self) -> int:
+        return len(self._datos)
+
+
+class AlmacenSQLite:
+    """LRU con expiración en un archivo SQLite compartido entre procesos"""
+
+    def __init__(self, maximo: int, ruta: str = CACHE_FOLIOS_RUTA):
+        self.maximo = maximo
+        self.ruta = ruta
+        self._local = threading.local()
+        with self._conexion() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_folios ("
+                "clave TEXT PRIMARY KEY, valor BLOB NOT NULL, version INTEGER NOT NULL DEFAULT 0, "
+                "expira REAL NOT NULL, usado REAL NOT NULL)"
+            )
+            try:
+                # Archivos creados antes de que las entradas llevaran versión
+                conn.execute("ALTER TABLE cache_folios ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_folios_usado ON cache_folios (usado)")
+
+    def _conexion(self):
+        # Una conexión por hilo y por proceso (no se comparten tras un fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def obtener(self, clave: str):
+        ahora = time.time()
+        conn = self._conexion()
+        fila = conn.execute(
+            "SELECT version, valor, expira FROM cache_folios WHERE clave = ?", (clave,)
+        ).fetchone()
+        if fila is None:
+            return None
+        if fila[2] <= ahora:
+            conn.execute("DELETE FROM cache_folios WHERE clave = ? AND expira <= ?", (clave, ahora))
+            return None
+        conn.execute("UPDATE cache_folios SET usado = ? WHERE clave = ?", (ahora, clave))
+        return fila[0], fila[1]
+
+    def guardar(self, clave: str, valor: bytes, version: int, ttl: int):
+        ahora = time.time()
+        conn = self._conexion()
+        # Una sola sentencia: la comparación de versiones es atómica entre procesos
+        conn.execute(
+            "INSERT INTO cache_folios (clave, valor, version, expira, usado) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (clave) DO UPDATE SET valor = excluded.valor, version = excluded.version, "
+            "expira = excluded.expira, usado = excluded.usado "
+            "WHERE cache_folios.version <= excluded.version OR cache_folios.expira <= excluded.usado",
+            (clave, valor, version, ahora + ttl, ahora)
+        )
+        # Desalojar las menos usadas recientemente si se pasó del máximo
+        conn.execute(
+            "DELETE FROM cache_folios WHERE clave IN ("
+            "SELECT clave FROM cache_folios ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+            (self.maximo,)
+        )
+
+    def limpiar(self):
+        self._conexion().execute("DELETE FROM cache_folios")
+
+    def total(self) -> int:
+        return self._conexion().execute("SELECT COUNT(*) FROM cache_folios").fetchone()[0]
+
+
+ALMACENES = {"memoria": AlmacenMemoria, "sqlite": AlmacenSQLite}
+
+
+# ========= CACHÉ =========
+
+# Valor de una entrada invalidada; bloquea copias anteriores a su versión
+LAPIDA = b""
+
+class CacheFolios:
+    def __init__(self, almacen, ttl: int = CACHE_FOLIOS_TTL):
+        self.almacen = almacen
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def obtener(self, folio: str):
+        """(etag, cuerpo) del reporte con ese folio, o None si no está en caché"""
+        entrada = self.almacen.obtener(folio)
+        if entrada is None or entrada[1] == LAPIDA:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        etag, cuerpo = entrada[1].split(b"\n", 1)
+        return etag.decode(), cuerpo
+
+    def guardar(self, folio: str, etag: str, cuerpo: bytes, version: int):
+        """Guarda la respuesta leída con la versión `version` de reportes;
+        se ignora si el almacén ya tiene una versión posterior"""
+        self.almacen.guardar(folio, etag.encode() + b"\n" + cuerpo, version, self.ttl)
+
+    def invalidar(self, folio: str, version: int):
+        """Descarta el folio tras confirmar un cambio; `version` es la versión
+        de reportes leída después del commit"""
+        self.invalidaciones += 1
+        self.almacen.guardar(folio, LAPIDA, version, self.ttl)
+
+    def limpiar(self):
+        """Descarta todo (p. ej. al cambiar un catálogo incluido en la respuesta)"""
+        self.invalidaciones += 1
+        self.almacen.limpiar()
+
+    def estadisticas(self) -> dict:
+        """Contadores de este proceso y tamaño actual del almacén"""
+        consultas = self.aciertos + self.fallos
+        return {
+            "backend": type(self.almacen).__name__,
+            "maximo": self.almacen.maximo,
+            "ttl": self.ttl,
+            "entradas": self.almacen.total(),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "invalidaciones": self.invalidaciones,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else None
+        }
+
+
+cache_folios = CacheFolios(ALMACENES[CACHE_FOLIOS_BACKEND](CACHE_FOLIOS_MAXIMO))
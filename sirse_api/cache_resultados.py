@@ -0,0 +1,72 @@
+"""
+Caché de resultados de las estadísticas con TTL y una sola consulta por clave.
+
+Cada entrada guarda la versión de las tablas con la que se calculó (ver
+versiones.py): cualquier escritura en reportes o catálogos la invalida,
+también si ocurrió en otro proceso. El TTL cubre lo que depende de la hora
+(p. ej. "últimos 30 días").
+
+Si varias peticiones piden la misma clave sin entrada válida, solo la
+primera calcula; las demás esperan su resultado en lugar de repetir la
+consulta.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+ESTADISTICAS_CACHE_TTL = int(os.getenv("ESTADISTICAS_CACHE_TTL", "30"))
+ESTADISTICAS_CACHE_MAXIMO = int(os.getenv("ESTADISTICAS_CACHE_MAXIMO", "256"))
+
+# Segundos que una petición espera el cálculo en curso de otra
+ESTADISTICAS_CACHE_ESPERA = 30
+
+
+class CacheResultados:
+    def __init__(self, ttl: int = ESTADISTICAS_CACHE_TTL, maximo: int = ESTADISTICAS_CACHE_MAXIMO):
+        self.ttl = ttl
+        self.maximo = maximo
+        self._datos = OrderedDict()  # clave -> (version, expira, valor)
+        self._en_curso = {}  # (clave, version) -> Future
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, version, calcular):
+        """Valor de `clave` para `version`; si no hay uno vigente lo calcula con `calcular()`"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada and entrada[0] == version and entrada[1] > time.monotonic():
+                self._datos.move_to_end(clave)
+                return entrada[2]
+
+            calculo = self._en_curso.get((clave, version))
+            propio = calculo is None
+            if propio:
+                calculo = self._en_curso[(clave, version)] = Future()
+
+        if not propio:
+            return calculo.result(timeout=ESTADISTICAS_CACHE_ESPERA)
+
+        try:
+            valor = calcular()
+        except BaseException as error:
+            calculo.set_exception(error)
+            raise
+        else:
+            calculo.set_result(valor)
+            with self._lock:
+                self._datos[clave] = (version, time.monotonic() + self.ttl, valor)
+                self._datos.move_to_end(clave)
+                while len(self._datos) > self.maximo:
+                    self._datos.popitem(last=False)
+            return valor
+        finally:
+            with self._lock:
+                self._en_curso.pop((clave, version), None)
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+
+
+cache_estadisticas = CacheResultados()
@@ -0,0 +1,138 @@
+"""
+Caché en memoria de los catálogos de categorías y estados.
+
+Son tablas pequeñas que casi nunca cambian, así que se cargan una sola vez
+por proceso y se comparten entre routers. Los handlers de escritura de
+categorías y estados llaman a `invalidar()`; el TTL cubre los cambios hechos
+desde otros procesos.
+
+Para validar llaves foráneas la copia no basta: un id que no está en ella se
+confirma en la BD (puede haberse creado en otro proceso) antes de rechazarlo.
+"""
+import os
+import threading
+import time
+
+from . import models
+
+CATALOGOS_TTL = int(os.getenv("CATALOGOS_TTL", "300"))
+
+# Nombres de los estados del flujo de atención (ver seed_data.py)
+ESTADO_PENDIENTE = "Pendiente"
+ESTADO_EN_PROCESO = "En proceso"
+ESTADO_RESUELTO = "Resuelto"
+
+# Estados en los que un reporte ya no requiere atención
+ESTADOS_CERRADOS = (ESTADO_RESUELTO, "Rechazado", "Cerrado")
+
+# Categorías que atiende cada departamento, por nombre (seed_data.py y la
+# migración de categoria_departamento). Los que no aparecen no tienen categorías
+MAPEO_DEPARTAMENTOS = {
+    "Alumbrado Público": ["Alumbrado público"],
+    "Servicios Municipales": ["Basura", "Fuga de agua", "Animal callejero"],
+    "Obras Públicas": ["Baches"],
+    "Seguridad Pública": ["Seguridad", "Robo", "Vandalismo", "Persona sospechosa"],
+    "Tránsito y Vialidad": ["Accidente"],
+}
+
+
+class CatalogoCache:
+    def __init__(self, ttl: int = CATALOGOS_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._lock = threading.Lock()
+        self._datos = None  # (version, expira, categorias, estados)
+
+    def _cargar(self, db):
+        datos = self._datos
+        if datos and datos[0] == self.version and datos[1] > time.monotonic():
+            return datos
+
+        with self._lock:
+            datos = self._datos
+            if datos and datos[0] == self.version and datos[1] > time.monotonic():
+                return datos
+
+            version = self.version
+            categorias = {
+                id_categoria: {"nombre": nombre, "activo": activo}
+                for id_categoria, nombre, activo in db.query(
+                    models.Categoria.id_categoria,
+                    models.Categoria.nombre,
+                    models.Categoria.estado
+                )
+            }
+            estados = {
+                id_estado: {"nombre": nombre, "activo": activo}
+                for id_estado, nombre, activo in db.query(
+                    models.Estado.id_estado,
+                    models.Estado.nombre,
+                    models.Estado.activo
+                )
+            }
+            self._datos = (version, time.monotonic() + self.ttl, categorias, estados)
+            return self._datos
+
+    def categorias(self, db) -> dict:
+        """Categorías indexadas por id_categoria"""
+        return self._cargar(db)[2]
+
+    def estados(self, db) -> dict:
+        """Estados indexados por id_estado"""
+        return self._cargar(db)[3]
+
+    def invalidar(self):
+        """Descarta la copia actual; la siguiente lectura recarga desde la BD"""
+        with self._lock:
+            self.version += 1
+
+
+catalogos = CatalogoCache()
+
+
+def _existentes(db, en_copia: dict, columna, ids) -> set:
+    """Los `ids` que existen: los de la copia más los que faltan en ella y
+    sí están en la BD (una sola consulta). Si aparece alguno, la copia se recarga"""
+    ids = set(ids)
+    faltantes = ids - en_copia.keys()
+    if not faltantes:
+        return ids
+    encontrados = {valor for valor, in db.query(columna).filter(columna.in_(faltantes))}
+    if encontrados:
+        catalogos.invalidar()
+    return (ids - faltantes) | encontrados
+
+
+def categorias_existentes(db, ids) -> set:
+    return _existentes(db, catalogos.categorias(db), models.Categoria.id_categoria, ids)
+
+
+def estados_existentes(db, ids) -> set:
+    return _existentes(db, catalogos.estados(db), models.Estado.id_estado, ids)
+
+
+def existe_categoria(db, id_categoria: int) -> bool:
+    return id_categoria in categorias_existentes(db, [id_categoria])
+
+
+def existe_estado(db, id_estado: int) -> bool:
+    return id_estado in estados_existentes(db, [id_estado])
+
+
+def nombre_categoria(db, id_categoria: int):
+    categoria = catalogos.categorias(db).get(id_categoria)
+    return categoria["nombre"] if categoria else None
+
+
+def nombre_estado(db, id_estado: int):
+    estado = catalogos.estados(db).get(id_estado)
+    return estado["nombre"] if estado else None
+
+
+def ids_estados(db, nombres) -> list:
+    """id_estado de los estados con esos nombres (sin distinguir mayúsculas)"""
+    buscados = {nombre.lower() for nombre in nombres}
+    return [
+        id_estado for id_estado, estado in catalogos.estados(db).items()
+        if estado["nombre"].lower() in buscados
+    ]
@@ -0,0 +1,66 @@
+"""
+Detección de reportes duplicados al momento de crearlos.
+
+Un reporte nuevo es duplicado si existe otro reporte abierto de la misma
+categoría a menos de DUPLICADOS_RADIO_METROS y creado en las últimas
+DUPLICADOS_VENTANA_HORAS. La búsqueda usa el índice (id_categoria, created_at)
+más un recuadro sobre las coordenadas numéricas, así que solo se revisan
+unos cuantos candidatos; la distancia exacta se calcula en Python.
+"""
+import math
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from . import models
+from .catalogos import ESTADOS_CERRADOS, ids_estados
+
+DUPLICADOS_RADIO_METROS = float(os.getenv("DUPLICADOS_RADIO_METROS", "100"))
+DUPLICADOS_VENTANA_HORAS = float(os.getenv("DUPLICADOS_VENTANA_HORAS", "24"))
+
+RADIO_TIERRA_METROS = 6_371_000
+METROS_POR_GRADO = 111_320.0
+
+
+def distancia_metros(lat1, lon1, lat2, lon2) -> float:
+    """Distancia haversine entre dos puntos"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat = p2 - p1
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlon / 2) ** 2
+    return 2 * RADIO_TIERRA_METROS * math.asin(math.sqrt(a))
+
+
+def buscar_duplicado(db, id_categoria: int, latitud, longitud, ahora: datetime = None):
+    """Devuelve el id_reporte original más cercano o None si no hay duplicado"""
+    if latitud is None or longitud is None:
+        return None
+
+    # Hora de la BD: created_at la pone el reloj de la BD, no el de la app
+    ahora = ahora or db.scalar(select(func.now())).replace(tzinfo=None)
+    delta_lat = DUPLICADOS_RADIO_METROS / METROS_POR_GRADO
+    delta_lon = DUPLICADOS_RADIO_METROS / (METROS_POR_GRADO * max(math.cos(math.radians(latitud)), 0.01))
+
+    query = db.query(
+        models.Reporte.id_reporte,
+        models.Reporte.latitud_num,
+        models.Reporte.longitud_num
+    ).filter(
+        models.Reporte.id_categoria == id_categoria,
+        models.Reporte.created_at >= ahora - timedelta(hours=DUPLICADOS_VENTANA_HORAS),
+        models.Reporte.latitud_num.between(latitud - delta_lat, latitud + delta_lat),
+        models.Reporte.longitud_num.between(longitud - delta_lon, longitud + delta_lon),
+        models.Reporte.duplicado_de.is_(None)
+    )
+
+    cerrados = ids_estados(db, ESTADOS_CERRADOS)
+    if cerrados:
+        query = query.filter(models.Reporte.id_estado.notin_(cerrados))
+
+    mejor, mejor_distancia = None, DUPLICADOS_RADIO_METROS
+    for id_reporte, lat, lon in query:
+        distancia = distancia_metros(latitud, longitud, lat, lon)
+        if distancia <= mejor_distancia:
+            mejor, mejor_distancia = id_reporte, distancia
+    return mejor
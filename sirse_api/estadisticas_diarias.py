@@ -0,0 +1,99 @@
+"""
+Resumen diario de reportes (`reporte_stats_daily`).
+
+Guarda el total de reportes por (día, categoría, estado). Los handlers que
+crean, cambian de categoría/estado o eliminan reportes llaman a `sumar()`
+dentro de su propia transacción, así que el resumen nunca queda a medias.
+Las estadísticas leen de aquí: su costo depende de cuántos días y
+categorías hay, no de cuántos reportes.
+
+Para llenarlo por primera vez o corregirlo:
+    python -m sirse_api.estadisticas_diarias
+"""
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from . import models
+
+TABLA = models.ReporteStatsDaily.__table__
+
+
+def _dialecto(db) -> str:
+    # Acepta Session o Connection
+    bind = db if hasattr(db, "dialect") else db.get_bind()
+    return bind.dialect.name
+
+
+def sumar(db, id_categoria: int, id_estado: int, cantidad: int = 1, dia=None):
+    """Suma `cantidad` (negativa para restar) al total del día.
+
+    Sin `dia` se usa la fecha actual de la BD, la misma que tomará created_at.
+    """
+    fila = {
+        "dia": func.current_date() if dia is None else dia,
+        "id_categoria": id_categoria,
+        "id_estado": id_estado,
+        "total": cantidad,
+    }
+    motor = _dialecto(db)
+
+    if motor in ("postgresql", "sqlite"):
+        modulo = postgresql if motor == "postgresql" else sqlite
+        sentencia = modulo.insert(TABLA).values(**fila)
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=["dia", "id_categoria", "id_estado"],
+            set_={"total": TABLA.c.total + sentencia.excluded.total}
+        )
+    elif motor == "mysql":
+        sentencia = mysql.insert(TABLA).values(**fila)
+        sentencia = sentencia.on_duplicate_key_update(total=TABLA.c.total + sentencia.inserted.total)
+    else:
+        llave = (
+            (TABLA.c.dia == fila["dia"])
+            & (TABLA.c.id_categoria == id_categoria)
+            & (TABLA.c.id_estado == id_estado)
+        )
+        if db.execute(update(TABLA).where(llave).values(total=TABLA.c.total + cantidad)).rowcount:
+            return
+        sentencia = insert(TABLA).values(**fila)
+
+    db.execute(sentencia)
+
+
+def mover(db, dia, anterior: tuple, nuevo: tuple):
+    """Pasa un reporte del día `dia` de (categoría, estado) `anterior` a `nuevo`"""
+    if anterior == nuevo:
+        return
+    sumar(db, *anterior, cantidad=-1, dia=dia)
+    sumar(db, *nuevo, cantidad=1, dia=dia)
+
+
+def reconstruir(db):
+    """Recalcula todo el resumen desde `reportes` (una sola INSERT ... SELECT)"""
+    dia = func.date(models.Reporte.created_at)
+    db.execute(delete(TABLA))
+    db.execute(insert(TABLA).from_select(
+        ["dia", "id_categoria", "id_estado", "total"],
+        select(
+            dia,
+            models.Reporte.id_categoria,
+            models.Reporte.id_estado,
+            func.count(models.Reporte.id_reporte)
+        ).where(
+            models.Reporte.created_at.isnot(None)
+        ).group_by(dia, models.Reporte.id_categoria, models.Reporte.id_estado)
+    ))
+
+
+if __name__ == "__main__":
+    from .database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        reconstruir(db)
+        db.commit()
+        filas, total = db.query(func.count(), func.coalesce(func.sum(TABLA.c.total), 0)).select_from(TABLA).one()
+        print(f"reporte_stats_daily reconstruida: {filas} filas, {total} reportes")
+    finally:
+        db.close()
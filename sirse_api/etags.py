@@ -0,0 +1,25 @@
+"""
+ETags y respuestas 304 para lecturas de reportes
+"""
+import hashlib
+
+from fastapi import Request, Response
+
+
+def calcular_etag(*partes) -> str:
+    resumen = hashlib.sha1("|".join(str(parte) for parte in partes).encode("utf-8")).hexdigest()
+    return f'W/"{resumen[:20]}"'
+
+
+def coincide(request: Request, etag: str) -> bool:
+    """True si el cliente ya tiene esta versión (If-None-Match)"""
+    encabezado = request.headers.get("if-none-match")
+    if not encabezado:
+        return False
+
+    etiquetas = {etiqueta.strip().removeprefix("W/") for etiqueta in encabezado.split(",")}
+    return "*" in etiquetas or etag.removeprefix("W/") in etiquetas
+
+
+def no_modificado(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
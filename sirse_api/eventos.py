@@ -0,0 +1,123 @@
+"""
+Difusión de eventos en vivo para /estadisticas/stream (Server-Sent Events).
+
+Los handlers de escritura son síncronos y corren en el threadpool; los
+suscriptores esperan en el event loop. `publicar()` entrega el evento a la
+cola de cada suscriptor con `call_soon_threadsafe`, sin bloquear al handler.
+
+La difusión es por proceso: lo que ocurre en otro worker llega como una
+foto completa de las métricas (ver el vigilante en routers/estadisticas.py).
+Cada escritura de reportes confirmada aquí se cuenta en `difusor.escrituras`
+para que el vigilante no repita como foto lo que ya salió como delta.
+"""
+import asyncio
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from .catalogos import ESTADO_EN_PROCESO, ESTADO_PENDIENTE, ESTADO_RESUELTO, nombre_estado
+
+# Eventos pendientes por suscriptor; si un cliente no lee, se descartan los más viejos
+EVENTOS_MAXIMO_COLA = 100
+
+# Métrica de /estadisticas/generales que cuenta cada estado
+METRICA_POR_ESTADO = {
+    ESTADO_PENDIENTE.lower(): "reportes_pendientes",
+    ESTADO_EN_PROCESO.lower(): "reportes_proceso",
+    ESTADO_RESUELTO.lower(): "reportes_resueltos",
+}
+
+
+class Difusor:
+    def __init__(self):
+        self._suscriptores = set()  # (loop, cola)
+        self._lock = threading.Lock()
+        self.escrituras = 0  # escrituras de reportes confirmadas en este proceso
+
+    @property
+    def suscriptores(self) -> int:
+        return len(self._suscriptores)
+
+    @contextmanager
+    def suscribir(self):
+        """Cola de eventos para el suscriptor actual (llamar desde el event loop)"""
+        suscriptor = (asyncio.get_running_loop(), asyncio.Queue(EVENTOS_MAXIMO_COLA))
+        with self._lock:
+            self._suscriptores.add(suscriptor)
+        try:
+            yield suscriptor[1]
+        finally:
+            with self._lock:
+                self._suscriptores.discard(suscriptor)
+
+    def registrar_escritura(self):
+        with self._lock:
+            self.escrituras += 1
+
+    def publicar(self, tipo: str, datos):
+        """Envía el evento a todos los suscriptores; se puede llamar desde cualquier hilo"""
+        evento = {"tipo": tipo, "datos": datos}
+        with self._lock:
+            suscriptores = list(self._suscriptores)
+        for loop, cola in suscriptores:
+            try:
+                loop.call_soon_threadsafe(_encolar, cola, evento)
+            except RuntimeError:
+                pass  # el loop ya cerró; el suscriptor se retira solo
+
+
+def _encolar(cola: asyncio.Queue, evento: dict):
+    if cola.full():
+        cola.get_nowait()
+    cola.put_nowait(evento)
+
+
+difusor = Difusor()
+
+
+# ========= DELTAS DE MÉTRICAS =========
+
+def _sumar(deltas: dict, metrica, cantidad: int):
+    if metrica and cantidad:
+        deltas[metrica] = deltas.get(metrica, 0) + cantidad
+
+
+def _metrica_estado(db, id_estado):
+    nombre = nombre_estado(db, id_estado)
+    return METRICA_POR_ESTADO.get(nombre.lower()) if nombre else None
+
+
+def registrar_escritura():
+    """Escritura de reportes confirmada que no cambia las métricas (p. ej. multimedia)"""
+    difusor.registrar_escritura()
+
+
+def publicar_creados(db, por_estado: dict):
+    """Reportes nuevos: {id_estado: cantidad}"""
+    difusor.registrar_escritura()
+    deltas = {}
+    for id_estado, cantidad in por_estado.items():
+        _sumar(deltas, "total_reportes", cantidad)
+        _sumar(deltas, "reportes_ultimo_mes", cantidad)
+        _sumar(deltas, _metrica_estado(db, id_estado), cantidad)
+    if deltas:
+        difusor.publicar("delta", deltas)
+
+
+def publicar_cambio_estado(db, id_estado_anterior, id_estado_nuevo):
+    difusor.registrar_escritura()
+    deltas = {}
+    _sumar(deltas, _metrica_estado(db, id_estado_anterior), -1)
+    _sumar(deltas, _metrica_estado(db, id_estado_nuevo), 1)
+    if deltas:
+        difusor.publicar("delta", deltas)
+
+
+def publicar_eliminado(db, id_estado, created_at):
+    difusor.registrar_escritura()
+    deltas = {}
+    _sumar(deltas, "total_reportes", -1)
+    _sumar(deltas, _metrica_estado(db, id_estado), -1)
+    if created_at and created_at >= datetime.now() - timedelta(days=30):
+        _sumar(deltas, "reportes_ultimo_mes", -1)
+    difusor.publicar("delta", deltas)
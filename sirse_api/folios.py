@@ -0,0 +1,98 @@
+"""
+Asignación de folios únicos para reportes.
+
+Cada proceso reserva en la BD un bloque de números consecutivos
+(`UPDATE folio_secuencias SET siguiente = siguiente + N`) y los reparte
+en memoria. Dos procesos nunca reciben el mismo bloque, así que los folios
+no chocan y no hace falta reintentar. El sufijo aleatorio solo evita que
+los folios públicos sean predecibles.
+"""
+import os
+import secrets
+import string
+import threading
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+from .database import engine
+
+FOLIO_BLOQUE = int(os.getenv("FOLIO_BLOQUE", "100"))
+SECUENCIA_REPORTES = "reportes"
+CARACTERES_SUFIJO = string.ascii_uppercase + string.digits
+
+
+class AsignadorFolios:
+    def __init__(self, bind=engine, tamaño_bloque: int = FOLIO_BLOQUE, secuencia: str = SECUENCIA_REPORTES):
+        self.bind = bind
+        self.tamaño_bloque = tamaño_bloque
+        self.secuencia = secuencia
+        self._lock = threading.Lock()
+        self._pid = None
+        self._siguiente = 0
+        self._limite = 0
+
+    def _reservar(self, cantidad: int) -> int:
+        """Reserva `cantidad` números en su propia transacción y devuelve el primero"""
+        tabla = models.FolioSecuencia.__table__
+        incrementar = update(tabla).where(
+            tabla.c.nombre == self.secuencia
+        ).values(siguiente=tabla.c.siguiente + cantidad)
+
+        with self.bind.begin() as conn:
+            if conn.execute(incrementar).rowcount == 0:
+                # Primera reserva: crear el contador (otro proceso pudo ganarnos)
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(tabla).values(nombre=self.secuencia, siguiente=1))
+                except IntegrityError:
+                    pass
+                conn.execute(incrementar)
+
+            siguiente = conn.execute(
+                select(tabla.c.siguiente).where(tabla.c.nombre == self.secuencia)
+            ).scalar_one()
+
+        return siguiente - cantidad
+
+    def numeros(self, cantidad: int = 1) -> list:
+        """Devuelve `cantidad` números de secuencia nunca entregados antes"""
+        with self._lock:
+            # Un proceso hijo no debe reutilizar el bloque heredado del padre
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._siguiente = self._limite = 0
+
+            resultado = []
+            while len(resultado) < cantidad:
+                if self._siguiente >= self._limite:
+                    bloque = max(self.tamaño_bloque, cantidad - len(resultado))
+                    self._siguiente = self._reservar(bloque)
+                    self._limite = self._siguiente + bloque
+
+                tomar = min(cantidad - len(resultado), self._limite - self._siguiente)
+                resultado.extend(range(self._siguiente, self._siguiente + tomar))
+                self._siguiente += tomar
+
+            return resultado
+
+
+asignador = AsignadorFolios()
+
+
+def formatear_folio(numero: int) -> str:
+    fecha = datetime.now().strftime("%Y%m%d")
+    sufijo = ''.join(secrets.choice(CARACTERES_SUFIJO) for _ in range(4))
+    return f"SIRSE-{fecha}-{numero:07d}-{sufijo}"
+
+
+def generar_folio() -> str:
+    """Genera un folio único para el reporte"""
+    return formatear_folio(asignador.numeros(1)[0])
+
+
+def generar_folios(cantidad: int) -> list:
+    """Genera `cantidad` folios únicos reservando un solo bloque"""
+    return [formatear_folio(numero) for numero in asignador.numeros(cantidad)]
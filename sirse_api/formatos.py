@@ -0,0 +1,72 @@
+"""
+Serialización de respuestas.
+
+RespuestaJSON es la clase de respuesta por defecto de la app: usa orjson si
+está instalado. Las rutas con response_model las sigue serializando Pydantic
+directamente; orjson cubre las que regresan dicts (estadísticas, etc.).
+
+Formato columnar negociado por el encabezado Accept.
+
+En lugar de repetir las llaves en cada objeto, la respuesta trae una sola
+lista de columnas y las filas como arreglos:
+    {"columnas": ["id_reporte", "folio", ...], "filas": [[1, "SIRSE-...", ...], ...]}
+Se serializa directo de las tuplas de la consulta, sin objetos ORM ni Pydantic.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # opcional; sin orjson se usa json de la biblioteca estándar
+    orjson = None
+
+MEDIA_TYPE_COLUMNAR = "application/vnd.sirse.columnar+json"
+
+
+class RespuestaJSON(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_serializar)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_serializar
+        ).encode("utf-8")
+
+
+def acepta_columnar(request: Request) -> bool:
+    return MEDIA_TYPE_COLUMNAR in request.headers.get("accept", "")
+
+
+def _serializar(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def serializar_columnar(columnas, filas) -> bytes:
+    cuerpo = {"columnas": list(columnas), "filas": [tuple(fila) for fila in filas]}
+    if orjson is not None:
+        return orjson.dumps(cuerpo, default=_serializar)
+    return json.dumps(
+        cuerpo, ensure_ascii=False, separators=(",", ":"), default=_serializar
+    ).encode("utf-8")
+
+
+def variar_por_accept(response: Response) -> Response:
+    """Marca una respuesta de un endpoint que negocia el formato con Accept,
+    para que una caché compartida no entregue JSON a quien pidió columnar
+    (o al revés). Va en todas sus respuestas, no solo en la columnar"""
+    response.headers["Vary"] = "Accept"
+    return response
+
+
+def respuesta_columnar(columnas, filas) -> Response:
+    return variar_por_accept(Response(
+        content=serializar_columnar(columnas, filas),
+        media_type=MEDIA_TYPE_COLUMNAR
+    ))
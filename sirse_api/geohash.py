@@ -0,0 +1,41 @@
+"""
+Codificación geohash de coordenadas.
+Cada carácter adicional divide la celda en 32; los prefijos comunes
+identifican celdas vecinas, lo que permite agrupar puntos con un GROUP BY.
+"""
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION_MAXIMA = 9  # ~5 m
+
+
+def codificar(latitud, longitud, precision: int = PRECISION_MAXIMA):
+    """Devuelve el geohash de (latitud, longitud) o None si están fuera de rango"""
+    if latitud is None or longitud is None:
+        return None
+    if not (-90 <= latitud <= 90 and -180 <= longitud <= 180):
+        return None
+
+    rango_lat = [-90.0, 90.0]
+    rango_lon = [-180.0, 180.0]
+    resultado = []
+    bits = 0
+    contador = 0
+    es_longitud = True
+
+    while len(resultado) < precision:
+        rango, valor = (rango_lon, longitud) if es_longitud else (rango_lat, latitud)
+        medio = (rango[0] + rango[1]) / 2
+        if valor >= medio:
+            bits = (bits << 1) | 1
+            rango[0] = medio
+        else:
+            bits <<= 1
+            rango[1] = medio
+
+        es_longitud = not es_longitud
+        contador += 1
+        if contador == 5:
+            resultado.append(BASE32[bits])
+            bits = 0
+            contador = 0
+
+    return "".join(resultado)
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from .database import engine, Base
-from . import models
+from .formatos import RespuestaJSON
+from . import busqueda, models
 import os
 
 # Routers
@@ -12,6 +14,8 @@ from .routers import auth, categorias, estados, reportes, estadisticas, usuarios
 # ========= CREAR TABLAS (solo local) =========
 try:
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        busqueda.crear_indice(conn)
 except Exception:
     pass
 
@@ -20,7 +24,8 @@ except Exception:
 app = FastAPI(
     title="SIRSE API",
     description="Sistema Integral de Reportes de Seguridad y Emergencias",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=RespuestaJSON
 )
 
 
@@ -31,6 +36,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
+)
+
+
+# ========= COMPRESIÓN =========
+# gzip negociado con Accept-Encoding; los streams de eventos no se comprimen.
+# Respuestas más pequeñas que el mínimo no se comprimen (no compensa el CPU)
+COMPRESION_MINIMO_BYTES = int(os.getenv("COMPRESION_MINIMO_BYTES", "1024"))
+COMPRESION_NIVEL = int(os.getenv("COMPRESION_NIVEL", "6"))
+
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=COMPRESION_MINIMO_BYTES,
+    compresslevel=COMPRESION_NIVEL
 )
 
 
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, Date, DateTime, Float, ForeignKey, Index, func
+from sqlalchemy.orm import relationship, validates
 from .database import Base
+from .geohash import codificar as codificar_geohash
 from datetime import datetime
+import math
 
 # ==================== MODELO DE USUARIO ====================
 class Usuario(Base):
@@ -17,6 +19,24 @@ class Usuario(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+def coordenada_numerica(valor):
+    """Convierte la coordenada capturada como texto a float (None si no es válida)"""
+    try:
+        numero = float(str(valor).strip())
+    except (TypeError, ValueError):
+        return None
+    return numero if math.isfinite(numero) else None
+
+def columnas_coordenadas(latitud, longitud) -> dict:
+    """Columnas derivadas de latitud/longitud (para inserciones en bloque)"""
+    latitud_num = coordenada_numerica(latitud)
+    longitud_num = coordenada_numerica(longitud)
+    return {
+        "latitud_num": latitud_num,
+        "longitud_num": longitud_num,
+        "geohash": codificar_geohash(latitud_num, longitud_num),
+    }
+
 # ==================== MODELOS SIRSE ====================
 class Categoria(Base):
     __tablename__ = "categorias"
@@ -54,16 +74,89 @@ class Reporte(Base):
     longitud = Column(String(50), nullable=True)
     direccion = Column(String(255), nullable=True)
     
+    # Copia numérica de latitud/longitud para filtrar por área en el mapa
+    latitud_num = Column(Float, nullable=True)
+    longitud_num = Column(Float, nullable=True)
+    # Celda geohash; sus prefijos agrupan puntos en /reportes/mapa/clusters
+    geohash = Column(String(12), nullable=True, index=True)
+    
     id_categoria = Column(Integer, ForeignKey("categorias.id_categoria"), nullable=False)
     id_estado = Column(Integer, ForeignKey("estados.id_estado"), nullable=False)
+    # Reporte abierto previo del mismo incidente detectado al crear este
+    duplicado_de = Column(
+        Integer, ForeignKey("reportes.id_reporte", ondelete="SET NULL"), nullable=True, index=True
+    )
     
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Se incrementa en cada escritura del reporte o de su multimedia; va en el
+    # ETag porque updated_at no distingue dos cambios en el mismo segundo
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     categoria = relationship("Categoria", back_populates="reportes")
     estado = relationship("Estado", back_populates="reportes")
     multimedia = relationship("Multimedia", back_populates="reporte", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Paginación por cursor (created_at, id_reporte) en listar_reportes
+        Index("ix_reportes_created_at_id", "created_at", "id_reporte"),
+        # Consultas por bbox en /reportes/mapa/puntos
+        Index("ix_reportes_coordenadas", "longitud_num", "latitud_num"),
+        # Detección de duplicados: misma categoría en una ventana de tiempo
+        Index("ix_reportes_categoria_fecha", "id_categoria", "created_at"),
+    )
+
+    @validates("latitud", "longitud")
+    def sincronizar_coordenada(self, key, valor):
+        setattr(self, f"{key}_num", coordenada_numerica(valor))
+        self.geohash = codificar_geohash(self.latitud_num, self.longitud_num)
+        return valor
+
+class FolioSecuencia(Base):
+    """Contador compartido del que cada proceso reserva bloques de folios"""
+    __tablename__ = "folio_secuencias"
+
+    nombre = Column(String(50), primary_key=True)
+    siguiente = Column(BigInteger, nullable=False, default=1)
+
+class VersionTabla(Base):
+    """Contador que aumenta con cada escritura; sirve para ETags de listados"""
+    __tablename__ = "versiones_tablas"
+
+    nombre = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+class ReporteStatsDaily(Base):
+    """Total de reportes por día, categoría y estado; se mantiene al escribir reportes"""
+    __tablename__ = "reporte_stats_daily"
+
+    dia = Column(Date, primary_key=True)
+    id_categoria = Column(Integer, primary_key=True)
+    id_estado = Column(Integer, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+class ReporteTransicion(Base):
+    """Historial de cambios de estado de un reporte"""
+    __tablename__ = "reporte_transiciones"
+
+    id_transicion = Column(Integer, primary_key=True, autoincrement=True)
+    id_reporte = Column(Integer, ForeignKey("reportes.id_reporte", ondelete="CASCADE"), nullable=False)
+    id_estado_anterior = Column(Integer, nullable=True)
+    id_estado_nuevo = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_reporte_transiciones_reporte_fecha", "id_reporte", "created_at"),
+    )
+
+class Sketch(Base):
+    """Sketch de cuantiles serializado (ver sketches.py), p. ej. tiempos de resolución por categoría"""
+    __tablename__ = "sketches"
+
+    ambito = Column(String(50), primary_key=True)
+    clave = Column(String(50), primary_key=True)
+    datos = Column(Text, nullable=False)
+
 class Multimedia(Base):
     __tablename__ = "multimedia"
     
@@ -85,5 +178,12 @@ class Departamento(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+class CategoriaDepartamento(Base):
+    """Categorías que atiende cada departamento (una categoría puede tener varios)"""
+    __tablename__ = "categoria_departamento"
+
+    id_departamento = Column(Integer, ForeignKey("departamentos.id_departamento", ondelete="CASCADE"), primary_key=True)
+    id_categoria = Column(Integer, ForeignKey("categorias.id_categoria", ondelete="CASCADE"), primary_key=True)
+
 # Y agregar relación en Usuario si es necesario
 # departamento_id = Column(Integer, ForeignKey('departamentos.id_departamento'))
\ No newline at end of file
@@ -32,13 +32,17 @@ def crear_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def verificar_token(token: str):
+def leer_token(token: str):
+    """Contenido del token (sub, exp) si es válido y no ha expirado; None si no"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
+def verificar_token(token: str):
+    payload = leer_token(token)
+    return payload.get("sub") if payload else None
+
 # ============== FUNCIONES DE DEPENDENCIAS ==============
 async def obtener_usuario_actual(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
@@ -3,7 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from ..database import get_db
-from .. import models, schemas
+from .. import models, schemas, versiones
+from ..cache_folios import cache_folios
+from ..catalogos import catalogos
 from .auth import obtener_usuario_actual_db  # ← CORRECTO
 
 router = APIRouter(prefix="/api/categorias", tags=["Categorías"])
@@ -42,7 +44,10 @@ def crear_categoria(
     """Crear una nueva categoría"""
     db_categoria = models.Categoria(**categoria.dict())
     db.add(db_categoria)
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     db.refresh(db_categoria)
     return db_categoria
 
@@ -61,7 +66,10 @@ def actualizar_categoria(
     for key, value in categoria.dict(exclude_unset=True).items():
         setattr(db_categoria, key, value)
     
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     db.refresh(db_categoria)
     return db_categoria
 
@@ -77,5 +85,8 @@ def eliminar_categoria(
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     
     db_categoria.estado = False
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     return {"message": "Categoría desactivada correctamente"}
\ No newline at end of file
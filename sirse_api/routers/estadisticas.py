@@ -1,95 +1,336 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from datetime import datetime, timedelta
-from .. import models
-from ..database import get_db
-from .auth import obtener_usuario_actual_db
+from sqlalchemy import case, func, select
+from datetime import date, datetime, timedelta
+from typing import Annotated, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import json
+import os
+import time
+from .. import models, sketches, tendencias, transiciones, versiones
+from ..cache_resultados import cache_estadisticas
+from ..eventos import difusor
+from ..catalogos import (
+    ESTADO_EN_PROCESO, ESTADO_PENDIENTE, ESTADO_RESUELTO, ESTADOS_CERRADOS,
+    catalogos, ids_estados, nombre_categoria, nombre_estado
+)
+from ..database import SessionLocal, get_db
+from ..zonas_calientes import motor_zonas
+from .auth import leer_token, obtener_usuario_actual_db
 
 router = APIRouter(prefix="/estadisticas", tags=["Estadísticas"])
 
 
+def en_cache(endpoint):
+    """Sirve el resultado del endpoint desde cache_estadisticas.
+
+    La clave es el endpoint con sus parámetros; la entrada se invalida en
+    cuanto cambia la versión de reportes o catálogos (ver cache_resultados.py).
+    """
+    @functools.wraps(endpoint)
+    def envoltura(**kwargs):
+        db = kwargs["db"]
+        parametros = tuple(sorted(
+            (nombre, valor) for nombre, valor in kwargs.items() if nombre not in ("db", "current_user")
+        ))
+        version = versiones.obtener(db, versiones.REPORTES, versiones.CATALOGOS)
+        return cache_estadisticas.obtener(
+            (endpoint.__name__, parametros), version, lambda: endpoint(**kwargs)
+        )
+    return envoltura
+
+
 # ===============================================================
 #                      MÉTRICAS GENERALES
 # ===============================================================
 
+def _contar(condicion):
+    """COUNT condicional: cuenta solo las filas que cumplen `condicion`"""
+    return func.count(case((condicion, 1)))
+
+
+@en_cache
+def resumen_reportes(db: Session):
+    """Todos los conteos de /generales y /metricas-avanzadas en una sola consulta.
+
+    Los estados se buscan por nombre en el catálogo, no por id. El resultado
+    se guarda en caché con su propia clave, así que ambos endpoints comparten
+    la misma consulta por versión de los datos.
+    """
+    ahora = datetime.now()
+    inicio_mes = ahora.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    reporte = models.Reporte
+
+    categorias_activas = select(func.count(models.Categoria.id_categoria)).where(
+        models.Categoria.estado == True
+    ).scalar_subquery()
+
+    return db.query(
+        func.count(reporte.id_reporte).label("total"),
+        _contar(reporte.id_estado.in_(ids_estados(db, [ESTADO_PENDIENTE]))).label("pendientes"),
+        _contar(reporte.id_estado.in_(ids_estados(db, [ESTADO_EN_PROCESO]))).label("proceso"),
+        _contar(reporte.id_estado.in_(ids_estados(db, [ESTADO_RESUELTO]))).label("resueltos"),
+        _contar(reporte.created_at >= ahora - timedelta(days=30)).label("ultimo_mes"),
+        _contar(reporte.created_at >= inicio_mes).label("mes_actual"),
+        categorias_activas.label("categorias_activas")
+    ).one()
+
+
 @router.get("/generales")
+@en_cache
 def estadisticas_generales(
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    total_reportes = db.query(models.Reporte).count()
-    total_categorias = db.query(models.Categoria).filter(models.Categoria.estado == True).count()
-
-    reportes_pendientes = db.query(models.Reporte).filter(models.Reporte.id_estado == 1).count()
-    reportes_proceso = db.query(models.Reporte).filter(models.Reporte.id_estado == 2).count()
-    reportes_resueltos = db.query(models.Reporte).filter(models.Reporte.id_estado == 3).count()
-
-    hace_un_mes = datetime.now() - timedelta(days=30)
-    reportes_ultimo_mes = db.query(models.Reporte).filter(
-        models.Reporte.created_at >= hace_un_mes
-    ).count()
+    resumen = resumen_reportes(db=db)
 
     return {
-        "total_reportes": total_reportes,
-        "total_categorias": total_categorias,
-        "reportes_pendientes": reportes_pendientes,
-        "reportes_proceso": reportes_proceso,
-        "reportes_resueltos": reportes_resueltos,
-        "reportes_ultimo_mes": reportes_ultimo_mes
+        "total_reportes": resumen.total,
+        "total_categorias": resumen.categorias_activas,
+        "reportes_pendientes": resumen.pendientes,
+        "reportes_proceso": resumen.proceso,
+        "reportes_resueltos": resumen.resueltos,
+        "reportes_ultimo_mes": resumen.ultimo_mes
     }
 
 
+# ===============================================================
+#              MÉTRICAS EN VIVO (SERVER-SENT EVENTS)
+# ===============================================================
+
+# Cada cuánto el vigilante revisa si otro proceso escribió reportes
+SSE_INTERVALO = int(os.getenv("SSE_INTERVALO", "5"))
+
+# Comentario periódico para que proxies y navegador no cierren la conexión
+SSE_LATIDO = 15
+
+_vigilante = None
+
+
+def _evento_sse(tipo: str, datos) -> str:
+    return f"event: {tipo}\ndata: {json.dumps(datos, ensure_ascii=False)}\n\n"
+
+
+def _metricas_actuales():
+    db = SessionLocal()
+    try:
+        return estadisticas_generales(db=db, current_user=None)
+    finally:
+        db.close()
+
+
+def _version_actual():
+    db = SessionLocal()
+    try:
+        return versiones.obtener(db, versiones.REPORTES, versiones.CATALOGOS)
+    finally:
+        db.close()
+
+
+async def _vigilar_versiones():
+    """Mientras haya suscriptores, envía una foto completa de las métricas cuando
+    otro proceso escribió reportes o cambiaron los catálogos.
+    Es una consulta por intervalo por proceso, sin importar cuántas pestañas haya.
+
+    Cada escritura incrementa la versión de reportes en uno; las que hizo este
+    proceso ya salieron como delta. `saldo` lleva las escrituras vistas en la
+    versión menos las registradas aquí: una escritura local registrada antes
+    de que la versión la refleje queda en negativo hasta el siguiente ciclo.
+    """
+    version = await run_in_threadpool(_version_actual)
+    escrituras = difusor.escrituras
+    saldo = 0
+    while difusor.suscriptores:
+        await asyncio.sleep(SSE_INTERVALO)
+        actual = await run_in_threadpool(_version_actual)
+        anteriores, escrituras = escrituras, difusor.escrituras
+        saldo += (actual[0] - version[0]) - (escrituras - anteriores)
+        if saldo > 0 or actual[1] != version[1]:
+            saldo = 0
+            difusor.publicar("metricas", await run_in_threadpool(_metricas_actuales))
+        version = actual
+
+
+def _usuario_existe(email: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.query(models.Usuario.id).filter(models.Usuario.email == email).first() is not None
+    finally:
+        db.close()
+
+
+async def _eventos_metricas(request: Request, expira: float):
+    """Eventos hasta que el cliente se desconecta o vence su token (`expira`, epoch)"""
+    global _vigilante
+    with difusor.suscribir() as cola:
+        if _vigilante is None or _vigilante.done():
+            _vigilante = asyncio.create_task(_vigilar_versiones())
+
+        yield _evento_sse("metricas", await run_in_threadpool(_metricas_actuales))
+        while not await request.is_disconnected():
+            restante = expira - time.time()
+            if restante <= 0:
+                return  # EventSource reconecta, recibe 401 y el panel pasa a sondeo
+            try:
+                evento = await asyncio.wait_for(cola.get(), min(SSE_LATIDO, restante))
+            except asyncio.TimeoutError:
+                yield ": latido\n\n"
+                continue
+            yield _evento_sse(evento["tipo"], evento["datos"])
+
+
+@router.get("/stream")
+async def stream_estadisticas(request: Request, token: str = Query(...)):
+    """Métricas de /generales en vivo por Server-Sent Events.
+
+    Al conectar se envía `metricas` (foto completa); después `delta` con los
+    cambios de cada alta, cambio de estado o baja, y `metricas` de nuevo si
+    hubo escrituras en otro proceso. El token va en la URL porque
+    EventSource no permite encabezados. El stream se cierra cuando vence el token.
+    """
+    payload = leer_token(token)
+    email = payload.get("sub") if payload else None
+    if (
+        email is None
+        or payload.get("exp") is None
+        or not await run_in_threadpool(_usuario_existe, email)
+    ):
+        raise HTTPException(status_code=401, detail="No se pudo validar el token")
+
+    return StreamingResponse(
+        _eventos_metricas(request, payload["exp"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ===============================================================
 #          🔥 NUEVO ENDPOINT — MÉTRICAS AVANZADAS
 # ===============================================================
 
 @router.get("/metricas-avanzadas")
+@en_cache
 def metricas_avanzadas(db: Session = Depends(get_db)):
     """Métricas para la página de estadísticas avanzadas"""
+    resumen = resumen_reportes(db=db)
 
     # Tasa de resolución REAL
-    total_reportes = db.query(models.Reporte).count()
-    reportes_resueltos = db.query(models.Reporte).filter(models.Reporte.id_estado == 3).count()
-    tasa_resolucion = (reportes_resueltos / total_reportes * 100) if total_reportes > 0 else 0
-
-    # Reportes de este mes REAL
-    mes_actual = datetime.now().month
-    año_actual = datetime.now().year
-
-    reportes_mes = db.query(models.Reporte).filter(
-        extract('month', models.Reporte.created_at) == mes_actual,
-        extract('year', models.Reporte.created_at) == año_actual
-    ).count()
+    tasa_resolucion = (resumen.resueltos / resumen.total * 100) if resumen.total > 0 else 0
 
     return {
         "tasa_resolucion": round(tasa_resolucion, 1),
-        "tiempo_respuesta": 4.2,  # temporal
+        "tiempo_respuesta": transiciones.mediana_global(db),  # horas hasta "Resuelto" (mediana)
         "satisfaccion": 4.6,      # temporal
-        "reportes_mes_actual": reportes_mes
+        "reportes_mes_actual": resumen.mes_actual
+    }
+
+
+# ===============================================================
+#                    TIEMPOS DE RESOLUCIÓN
+# ===============================================================
+
+@router.get("/tiempos-resolucion")
+@en_cache
+def tiempos_resolucion(
+    agrupar: str = Query("categoria", pattern="^(categoria|mes)$"),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(obtener_usuario_actual_db)
+):
+    """Horas desde la creación hasta "Resuelto": total, promedio y p50/p90/p99
+    por categoría o por mes de resolución, y de todos los grupos combinados"""
+    ambito = transiciones.RESOLUCION_CATEGORIA if agrupar == "categoria" else transiciones.RESOLUCION_MES
+    por_clave = sketches.cargar(db, ambito)
+
+    grupos = []
+    for clave in sorted(por_clave, key=lambda c: int(c) if agrupar == "categoria" else c):
+        grupo = {"clave": clave, **transiciones.resumen(por_clave[clave])}
+        if agrupar == "categoria":
+            grupo["categoria"] = nombre_categoria(db, int(clave))
+        grupos.append(grupo)
+
+    return {
+        "unidad": "horas",
+        "agrupar": agrupar,
+        "global": transiciones.resumen(sketches.combinados(por_clave.values())),
+        "grupos": grupos
     }
 
 
 # ===============================================================
-#        🔥 NUEVO ENDPOINT — TENDENCIAS POR SEMANA
+#                 TENDENCIAS (SERIES DE TIEMPO)
 # ===============================================================
 
+# Rango por defecto de /tendencias según la granularidad
+RANGO_TENDENCIAS = {"day": timedelta(days=30), "week": timedelta(weeks=12), "month": timedelta(days=365)}
+
+
+@router.get("/tendencias")
+@en_cache
+def tendencias_reportes(
+    desde: Optional[date] = Query(None, alias="from"),
+    hasta: Optional[date] = Query(None, alias="to"),
+    granularidad: str = Query("day", pattern="^(day|week|month)$"),
+    id_categoria: int = None,
+    id_estado: int = None,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(obtener_usuario_actual_db)
+):
+    """Reportes por periodo y categoría en el rango semiabierto [from, to).
+
+    Cada serie trae un valor por periodo, con ceros donde no hubo reportes.
+    Los periodos se identifican por su fecha de inicio (lunes en `week`).
+    """
+    hasta = hasta or date.today() + timedelta(days=1)
+    desde = desde or hasta - RANGO_TENDENCIAS[granularidad]
+    if desde >= hasta:
+        raise HTTPException(status_code=400, detail="El rango es vacío: from debe ser menor que to")
+
+    if len(tendencias.periodos(desde, hasta, granularidad)) > tendencias.TENDENCIAS_MAX_PERIODOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El rango excede {tendencias.TENDENCIAS_MAX_PERIODOS} periodos, use otra granularidad"
+        )
+
+    inicios, categorias, matriz = tendencias.calcular(
+        db, desde, hasta, granularidad, id_categoria, id_estado
+    )
+
+    return {
+        "granularidad": granularidad,
+        "desde": desde,
+        "hasta": hasta,
+        "periodos": [str(inicio) for inicio in inicios.astype("datetime64[D]")],
+        "series": [
+            {
+                "id_categoria": id_cat,
+                "categoria": nombre_categoria(db, id_cat),
+                "datos": fila.tolist()
+            }
+            for id_cat, fila in zip(categorias, matriz)
+        ],
+        "totales": matriz.sum(axis=0).tolist()
+    }
+
+
 @router.get("/tendencias-semana")
+@en_cache
 def tendencias_semana(db: Session = Depends(get_db)):
-    """Datos para gráfico de tendencias semanales"""
+    """Datos para gráfico de tendencias semanales: las 4 categorías con
+    más reportes en las últimas 4 semanas (incluida la actual)"""
+    hasta = date.today() + timedelta(days=1)
+    desde = date.today() - timedelta(days=date.today().weekday(), weeks=3)
 
-    categorias = db.query(models.Categoria.nombre).limit(4).all()
-    categorias_nombres = [cat[0] for cat in categorias]
+    inicios, categorias, matriz = tendencias.calcular(db, desde, hasta, "week")
+    principales = matriz.sum(axis=1).argsort(kind="stable")[::-1][:4]
 
     return {
-        "categorias": categorias_nombres,
-        "semanas": ["Sem 1", "Sem 2", "Sem 3", "Sem 4"],
-        "datos": [
-            [30, 45, 35, 50],
-            [25, 30, 40, 35],
-            [20, 25, 30, 28],
-            [15, 20, 25, 22]
-        ]
+        "categorias": [nombre_categoria(db, categorias[i]) for i in principales],
+        "semanas": [f"Sem {inicio.item():%d/%m}" for inicio in inicios],
+        "datos": matriz[principales].tolist()
     }
 
 
@@ -97,75 +338,114 @@ def tendencias_semana(db: Session = Depends(get_db)):
 #                ESTADÍSTICAS EXISTENTES
 # ===============================================================
 
+def _totales_por(db: Session, columna):
+    """{clave: total} sumando el resumen diario por `columna` (categoría o estado)"""
+    return {
+        clave: int(total)
+        for clave, total in db.query(
+            columna, func.sum(models.ReporteStatsDaily.total)
+        ).group_by(columna)
+    }
+
+
+def _validar_rango(desde, hasta):
+    if desde and hasta and desde >= hasta:
+        raise HTTPException(status_code=400, detail="El rango es vacío: from debe ser menor que to")
+
+
+def _totales_por_mes(db: Session, desde: Optional[date] = None, hasta: Optional[date] = None):
+    """[(inicio del mes, total)] de cada mes que toca [desde, hasta), con ceros.
+
+    Filtra por rango sobre `reporte_stats_daily.dia` (llave primaria), sin
+    funciones sobre la columna. Sin `desde` empieza en el primer día con reportes.
+    """
+    hasta = hasta or date.today() + timedelta(days=1)
+    desde = desde or db.query(func.min(models.ReporteStatsDaily.dia)).scalar()
+    if desde is None or desde >= hasta:
+        return []
+
+    inicios, _, matriz = tendencias.calcular(db, desde, hasta, "month")
+    return list(zip(inicios.astype("datetime64[D]").tolist(), matriz.sum(axis=0).tolist()))
+
+
+def _totales_categorias(db: Session):
+    """(nombre, total) de todas las categorías, incluidas las que no tienen reportes"""
+    totales = _totales_por(db, models.ReporteStatsDaily.id_categoria)
+    return [
+        (categoria["nombre"], totales.get(id_categoria, 0))
+        for id_categoria, categoria in catalogos.categorias(db).items()
+    ]
+
+
 @router.get("/por-categoria")
+@en_cache
 def reportes_por_categoria(
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    resultado = db.query(
-        models.Categoria.nombre,
-        func.count(models.Reporte.id_reporte).label('total')
-    ).outerjoin(
-        models.Reporte, models.Categoria.id_categoria == models.Reporte.id_categoria
-    ).group_by(
-        models.Categoria.id_categoria, models.Categoria.nombre
-    ).all()
-
-    return [{"categoria": nombre, "total": total} for nombre, total in resultado]
+    return [{"categoria": nombre, "total": total} for nombre, total in _totales_categorias(db)]
 
 
 @router.get("/por-estado")
+@en_cache
 def reportes_por_estado(
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    resultado = db.query(
-        models.Estado.nombre,
-        func.count(models.Reporte.id_reporte).label('total')
-    ).outerjoin(
-        models.Reporte, models.Estado.id_estado == models.Reporte.id_estado
-    ).group_by(
-        models.Estado.id_estado, models.Estado.nombre
-    ).all()
+    totales = _totales_por(db, models.ReporteStatsDaily.id_estado)
+
+    return [
+        {"estado": estado["nombre"], "total": totales.get(id_estado, 0)}
+        for id_estado, estado in catalogos.estados(db).items()
+    ]
+
+
+MESES = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+         'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre']
 
-    return [{"estado": nombre, "total": total} for nombre, total in resultado]
+MESES_CORTOS = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
+                'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
 
 
 @router.get("/por-mes")
+@en_cache
 def reportes_por_mes(
+    desde: Annotated[Optional[date], Query(alias="from")] = None,
+    hasta: Annotated[Optional[date], Query(alias="to")] = None,
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    resultado = db.query(
-        extract('year', models.Reporte.created_at).label('año'),
-        extract('month', models.Reporte.created_at).label('mes'),
-        func.count(models.Reporte.id_reporte).label('total')
-    ).group_by('año', 'mes').order_by('año', 'mes').all()
-
-    meses = {
-        1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-        5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-        9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-    }
+    """Reportes por mes (solo meses con reportes) en el rango semiabierto [from, to)"""
+    _validar_rango(desde, hasta)
 
     return [
         {
-            "año": int(año),
-            "mes": int(mes),
-            "nombre_mes": meses[int(mes)],
+            "año": inicio.year,
+            "mes": inicio.month,
+            "nombre_mes": MESES[inicio.month - 1],
             "total": total
         }
-        for año, mes, total in resultado
+        for inicio, total in _totales_por_mes(db, desde, hasta)
+        if total
     ]
 
 
 @router.get("/recientes")
+@en_cache
 def reportes_recientes(
     limit: int = 10,
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    reportes = db.query(models.Reporte).order_by(
+    reportes = db.query(
+        models.Reporte.id_reporte,
+        models.Reporte.folio,
+        models.Reporte.nombre,
+        models.Reporte.apellido_paterno,
+        models.Reporte.id_categoria,
+        models.Reporte.id_estado,
+        models.Reporte.created_at
+    ).order_by(
         models.Reporte.created_at.desc()
     ).limit(limit).all()
 
@@ -174,8 +454,8 @@ def reportes_recientes(
             "id_reporte": r.id_reporte,
             "folio": r.folio,
             "nombre": f"{r.nombre} {r.apellido_paterno}",
-            "categoria": r.categoria.nombre,
-            "estado": r.estado.nombre,
+            "categoria": nombre_categoria(db, r.id_categoria),
+            "estado": nombre_estado(db, r.id_estado),
             "created_at": r.created_at
         }
         for r in reportes
@@ -188,68 +468,58 @@ def zonas_con_mas_reportes(
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    resultado = db.query(
-        models.Reporte.direccion,
-        func.count(models.Reporte.id_reporte).label('total')
-    ).filter(
-        models.Reporte.direccion.isnot(None)
-    ).group_by(
-        models.Reporte.direccion
-    ).order_by(
-        func.count(models.Reporte.id_reporte).desc()
-    ).limit(limit).all()
-
-    return [{"direccion": direccion, "total": total} for direccion, total in resultado]
+    """Zonas con mayor densidad de reportes (centroide, radio y dirección de referencia)"""
+    return motor_zonas.zonas(db, limit)
 
 
 # ===============================================================
 #         GRÁFICOS PARA CHART.JS (MESES Y CATEGORÍAS)
 # ===============================================================
 
+# Con Annotated el valor por defecto es None también cuando la función se
+# llama directamente (p. ej. el panel por_mes_chart de /dashboard)
 @router.get("/por-mes-chart")
+@en_cache
 def reportes_por_mes_chart(
+    desde: Annotated[Optional[date], Query(alias="from")] = None,
+    hasta: Annotated[Optional[date], Query(alias="to")] = None,
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
-    try:
-        resultado = db.query(
-            extract('month', models.Reporte.created_at).label('mes'),
-            func.count(models.Reporte.id_reporte).label('total')
-        ).group_by('mes').order_by('mes').all()
+    """Reportes por mes para Chart.js; por defecto los últimos 12 meses.
 
-        meses = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
-                 'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+    Cada etiqueta lleva el año, así que el mismo mes de años distintos no se mezcla.
+    """
+    _validar_rango(desde, hasta)
+    if desde is None:
+        hoy = date.today()
+        indice = hoy.year * 12 + hoy.month - 1 - 11
+        desde = date(indice // 12, indice % 12 + 1, 1)
 
-        datos = [0] * 12
-        for mes, total in resultado:
-            mes = int(mes)
-            if 1 <= mes <= 12:
-                datos[mes - 1] = total
+    try:
+        resultado = _totales_por_mes(db, desde, hasta)
 
-        return {"labels": meses, "values": datos}
+        return {
+            "labels": [f"{MESES_CORTOS[inicio.month - 1]} {inicio.year}" for inicio, _ in resultado],
+            "values": [total for _, total in resultado]
+        }
 
     except Exception as e:
         print("Error:", e)
         return {
-            "labels": meses,
+            "labels": MESES_CORTOS,
             "values": [5, 8, 12, 6, 9, 15, 10, 7, 11, 8, 6, 4]
         }
 
 
 @router.get("/por-categoria-chart")
+@en_cache
 def reportes_por_categoria_chart(
     db: Session = Depends(get_db),
     current_user: str = Depends(obtener_usuario_actual_db)
 ):
     try:
-        resultado = db.query(
-            models.Categoria.nombre,
-            func.count(models.Reporte.id_reporte).label('total')
-        ).outerjoin(
-            models.Reporte, models.Categoria.id_categoria == models.Reporte.id_categoria
-        ).group_by(
-            models.Categoria.id_categoria, models.Categoria.nombre
-        ).all()
+        resultado = _totales_categorias(db)
 
         return {
             "labels": [nombre for nombre, total in resultado],
@@ -263,42 +533,99 @@ def reportes_por_categoria_chart(
         }
 
 @router.get("/rendimiento-departamentos")
+@en_cache
 def rendimiento_departamentos(db: Session = Depends(get_db)):
-    """Rendimiento por departamento (datos de ejemplo basados en categorías)"""
-    
-    # Mapear categorías a departamentos
-    mapeo_departamentos = {
-        "Alumbrado Público": ["Alumbrado público"],
-        "Servicios Municipales": ["Basura", "Fuga de agua", "Animal callejero"],
-        "Parques y Jardines": [],  # No hay categorías directas
-        "Obras Públicas": ["Baches"]
+    """Reportes atendidos, resueltos y abiertos por departamento activo.
+
+    Los departamentos se unen a sus categorías (categoria_departamento) y al
+    rollup diario en una sola consulta agrupada. La eficiencia es el
+    porcentaje de reportes resueltos; null si el departamento no tiene reportes.
+    """
+    depto = models.Departamento
+    asignacion = models.CategoriaDepartamento
+    diario = models.ReporteStatsDaily
+
+    def sumar_si(condicion):
+        return func.coalesce(func.sum(case((condicion, diario.total), else_=0)), 0)
+
+    filas = db.query(
+        depto.nombre,
+        func.coalesce(func.sum(diario.total), 0).label("total"),
+        sumar_si(diario.id_estado.in_(ids_estados(db, [ESTADO_RESUELTO]))).label("resueltos"),
+        sumar_si(diario.id_estado.not_in(ids_estados(db, ESTADOS_CERRADOS))).label("abiertos"),
+    ).outerjoin(
+        asignacion, asignacion.id_departamento == depto.id_departamento
+    ).outerjoin(
+        diario, diario.id_categoria == asignacion.id_categoria
+    ).filter(
+        depto.activo.is_(True)
+    ).group_by(
+        depto.id_departamento, depto.nombre
+    ).order_by(depto.nombre).all()
+
+    return [
+        {
+            "departamento": nombre,
+            "reportes_atendidos": int(total),
+            "reportes_resueltos": int(resueltos),
+            "reportes_abiertos": int(abiertos),
+            "eficiencia": round(int(resueltos) * 100 / int(total), 1) if total else None
+        }
+        for nombre, total, resueltos, abiertos in filas
+    ]
+
+# ===============================================================
+#              DASHBOARD (TODOS LOS PANELES JUNTOS)
+# ===============================================================
+
+# Hilos para consultar los paneles en paralelo (cada uno con su conexión del pool)
+DASHBOARD_HILOS = int(os.getenv("DASHBOARD_HILOS", "5"))
+
+_ejecutor_dashboard = ThreadPoolExecutor(max_workers=DASHBOARD_HILOS, thread_name_prefix="dashboard")
+
+PANELES_DASHBOARD = {
+    "generales": lambda db: estadisticas_generales(db=db, current_user=None),
+    "por_categoria_chart": lambda db: reportes_por_categoria_chart(db=db, current_user=None),
+    "por_mes_chart": lambda db: reportes_por_mes_chart(db=db, current_user=None),
+    "recientes": lambda db: reportes_recientes(limit=10, db=db, current_user=None),
+    "zonas_calientes": lambda db: motor_zonas.zonas(db, 10),
+}
+
+
+def _calcular_panel(panel):
+    """(resultado, error, ms) de un panel, en su propia sesión"""
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        return panel(db), None, (time.perf_counter() - inicio) * 1000
+    except Exception as e:
+        print(f"Error en panel del dashboard: {e}")
+        return None, str(e), (time.perf_counter() - inicio) * 1000
+    finally:
+        db.close()
+
+
+@router.get("/dashboard")
+def dashboard(current_user: str = Depends(obtener_usuario_actual_db)):
+    """Todos los paneles del dashboard en una sola respuesta.
+
+    Los paneles se consultan al mismo tiempo, así que la latencia la marca el
+    más lento y no la suma. `tiempos_ms` trae lo que tardó cada uno; un panel
+    que falla regresa null y su mensaje en `errores` sin afectar a los demás.
+    """
+    inicio = time.perf_counter()
+    futuros = {
+        nombre: _ejecutor_dashboard.submit(_calcular_panel, panel)
+        for nombre, panel in PANELES_DASHBOARD.items()
     }
-    
-    # Calcular reportes por departamento
-    rendimiento = []
-    
-    for depto, categorias in mapeo_departamentos.items():
-        if categorias:
-            # Si tiene categorías mapeadas, contar reportes de esas categorías
-            total = db.query(models.Reporte).join(
-                models.Categoria
-            ).filter(
-                models.Categoria.nombre.in_(categorias)
-            ).count()
-        else:
-            # Si no tiene categorías, usar número basado en el departamento
-            base_numbers = {
-                "Alumbrado Público": 45,
-                "Servicios Municipales": 32, 
-                "Parques y Jardines": 28,
-                "Obras Públicas": 15
-            }
-            total = base_numbers.get(depto, 0)
-        
-        rendimiento.append({
-            "departamento": depto,
-            "reportes_atendidos": total,
-            "eficiencia": min(95, 70 + (total // 2))  # Ejemplo de cálculo
-        })
-    
-    return rendimiento
\ No newline at end of file
+
+    respuesta = {"tiempos_ms": {}, "errores": {}}
+    for nombre, futuro in futuros.items():
+        resultado, error, ms = futuro.result()
+        respuesta[nombre] = resultado
+        respuesta["tiempos_ms"][nombre] = round(ms, 1)
+        if error:
+            respuesta["errores"][nombre] = error
+
+    respuesta["tiempos_ms"]["total"] = round((time.perf_counter() - inicio) * 1000, 1)
+    return respuesta
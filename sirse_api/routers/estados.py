@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from .. import models, schemas
+from .. import models, schemas, versiones
+from ..cache_folios import cache_folios
+from ..catalogos import catalogos
 from ..database import get_db
 from .auth import obtener_usuario_actual_db  # <-- Agregar esta línea
 
@@ -12,7 +14,10 @@ def crear_estado(estado: schemas.EstadoCreate, db: Session = Depends(get_db)):
     """Crear un nuevo estado"""
     nuevo_estado = models.Estado(**estado.dict())
     db.add(nuevo_estado)
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     db.refresh(nuevo_estado)
     return nuevo_estado
 
@@ -45,7 +50,10 @@ def actualizar_estado(estado_id: int, estado: schemas.EstadoUpdate, db: Session
     for key, value in estado.dict(exclude_unset=True).items():
         setattr(db_estado, key, value)
     
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     db.refresh(db_estado)
     return db_estado
 
@@ -57,5 +65,8 @@ def eliminar_estado(estado_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Estado no encontrado")
     
     estado.activo = False
+    versiones.incrementar(db, versiones.CATALOGOS)
     db.commit()
+    catalogos.invalidar()
+    cache_folios.limpiar()
     return {"message": "Estado desactivado correctamente"}
\ No newline at end of file
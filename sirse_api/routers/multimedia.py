@@ -4,7 +4,8 @@ from typing import List
 import os
 import uuid
 from pathlib import Path
-from .. import models, schemas
+from .. import eventos, models, schemas, versiones
+from ..cache_folios import cache_folios
 from ..database import get_db
 
 router = APIRouter(prefix="/multimedia", tags=["Multimedia"])
@@ -60,7 +61,11 @@ async def subir_archivo(
     )
     
     db.add(nuevo_multimedia)
+    reporte.version = models.Reporte.version + 1  # cambia el ETag del reporte
+    versiones.incrementar(db, versiones.REPORTES)
     db.commit()
+    cache_folios.invalidar(reporte.folio, versiones.obtener(db, versiones.REPORTES)[0])
+    eventos.registrar_escritura()
     db.refresh(nuevo_multimedia)
     
     return nuevo_multimedia
@@ -91,7 +96,12 @@ def eliminar_multimedia(multimedia_id: int, db: Session = Depends(get_db)):
         print(f"Error al eliminar archivo: {e}")
     
     # Eliminar registro de la base de datos
+    reporte = multimedia.reporte
+    reporte.version = models.Reporte.version + 1  # cambia el ETag del reporte
     db.delete(multimedia)
+    versiones.incrementar(db, versiones.REPORTES)
     db.commit()
+    cache_folios.invalidar(reporte.folio, versiones.obtener(db, versiones.REPORTES)[0])
+    eventos.registrar_escritura()
     
     return {"message": "Archivo eliminado correctamente"}
\ No newline at end of file
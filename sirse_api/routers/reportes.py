@@ -1,85 +1,552 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, func, insert, literal, select, tuple_
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
+from collections import Counter
 from datetime import datetime
-import random
-import string
-from .. import models, schemas
-from ..database import get_db
+import base64
+import binascii
+import csv
+import io
+import json
+from .. import busqueda, estadisticas_diarias, etags, eventos, models, schemas, transiciones, versiones
+from ..cache_folios import cache_folios
+from ..catalogos import catalogos, categorias_existentes, estados_existentes, existe_categoria, existe_estado
+from ..database import SessionLocal, get_db
+from ..duplicados import buscar_duplicado
+from ..folios import generar_folio, generar_folios
+from ..formatos import RespuestaJSON, acepta_columnar, respuesta_columnar, variar_por_accept
+from ..zonas_calientes import motor_zonas
 from .auth import obtener_usuario_actual_db
 
 
 router = APIRouter(prefix="/reportes", tags=["Reportes"])
 
-def generar_folio():
-    """Genera un folio único para el reporte"""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    random_chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-    return f"SIRSE-{timestamp}-{random_chars}"
+# Máximo de reportes aceptados por llamada a /reportes/bulk
+MAX_REPORTES_LOTE = 1000
+
+# Longitud máxima de cada columna de texto de reportes (p. ej. nombre: 100)
+LONGITUDES_REPORTE = {
+    columna.name: columna.type.length
+    for columna in models.Reporte.__table__.columns
+    if isinstance(columna.type, String) and columna.type.length
+}
+
+# Zoom del mapa a partir del cual se devuelven puntos individuales
+ZOOM_PUNTOS_INDIVIDUALES = 16
+
+# (zoom máximo, precisión de geohash) para agrupar; celdas de ~1/8 del mosaico
+PRECISION_POR_ZOOM = ((2, 1), (4, 2), (6, 3), (8, 4), (11, 5), (13, 6), (15, 7))
+
+# Filas que se leen del cursor del servidor por cada viaje en /reportes/export
+LOTE_EXPORTACION = 1000
+
+# Columnas planas de reportes para exportación y formato columnar
+COLUMNAS_REPORTE = (
+    models.Reporte.id_reporte,
+    models.Reporte.folio,
+    models.Reporte.nombre,
+    models.Reporte.apellido_paterno,
+    models.Reporte.apellido_materno,
+    models.Reporte.telefono_reportante,
+    models.Reporte.descripcion,
+    models.Reporte.latitud,
+    models.Reporte.longitud,
+    models.Reporte.direccion,
+    models.Reporte.id_categoria,
+    models.Reporte.id_estado,
+    models.Reporte.duplicado_de,
+    models.Reporte.created_at,
+    models.Reporte.updated_at,
+)
+
+# Columnas de ReporteSimple para el formato columnar del mapa
+COLUMNAS_MAPA = (
+    models.Reporte.id_reporte,
+    models.Reporte.nombre,
+    models.Reporte.apellido_paterno,
+    models.Reporte.apellido_materno,
+    models.Reporte.folio,
+    models.Reporte.descripcion,
+    models.Reporte.latitud,
+    models.Reporte.longitud,
+    models.Reporte.direccion,
+    models.Reporte.created_at,
+)
+
+# Carga anticipada de las relaciones anidadas en ReporteResponse
+# (evita una consulta por reporte al serializar listas)
+CARGA_RELACIONES = (
+    joinedload(models.Reporte.categoria),
+    joinedload(models.Reporte.estado),
+    selectinload(models.Reporte.multimedia),
+)
+
+def filtrar_reportes(query, id_categoria=None, id_estado=None, desde=None, hasta=None):
+    """Aplica los filtros comunes de listado (rango de fechas semiabierto [desde, hasta))"""
+    if id_categoria:
+        query = query.filter(models.Reporte.id_categoria == id_categoria)
+    
+    if id_estado:
+        query = query.filter(models.Reporte.id_estado == id_estado)
+    
+    if desde:
+        query = query.filter(models.Reporte.created_at >= desde)
+    
+    if hasta:
+        query = query.filter(models.Reporte.created_at < hasta)
+    
+    return query
+
+def parsear_bbox(bbox: str):
+    """Convierte 'minLon,minLat,maxLon,maxLat' en una tupla de floats"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(valor) for valor in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox inválido, use minLon,minLat,maxLon,maxLat")
+    if min_lon > max_lon or min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="bbox inválido, use minLon,minLat,maxLon,maxLat")
+    return min_lon, min_lat, max_lon, max_lat
+
+def filtrar_area(query, bbox: Optional[str] = None):
+    """Limita la consulta a reportes con coordenadas, dentro de `bbox` si se indica"""
+    if not bbox:
+        return query.filter(
+            models.Reporte.latitud_num.isnot(None),
+            models.Reporte.longitud_num.isnot(None)
+        )
+    
+    min_lon, min_lat, max_lon, max_lat = parsear_bbox(bbox)
+    return query.filter(
+        models.Reporte.longitud_num.between(min_lon, max_lon),
+        models.Reporte.latitud_num.between(min_lat, max_lat)
+    )
+
+def parsear_campos(fields: str):
+    """Convierte 'folio,id_estado,...' en columnas de COLUMNAS_REPORTE, en ese orden"""
+    disponibles = {columna.key: columna for columna in COLUMNAS_REPORTE}
+    nombres = list(dict.fromkeys(nombre.strip() for nombre in fields.split(",") if nombre.strip()))
+    invalidos = [nombre for nombre in nombres if nombre not in disponibles]
+    if not nombres or invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fields inválido, use una lista separada por comas de: {', '.join(disponibles)}"
+        )
+    return [disponibles[nombre] for nombre in nombres]
+
+def consultar_campos(db: Session, campos, *requeridas):
+    """Consulta solo `campos`, seguidos de las columnas `requeridas` que falten"""
+    nombres = {columna.key for columna in campos}
+    return db.query(*campos, *(columna for columna in requeridas if columna.key not in nombres))
+
+def respuesta_campos(request: Request, campos, filas):
+    """Responde solo las columnas de `campos` (primeras de cada fila),
+    como objetos o en formato columnar según el encabezado Accept"""
+    nombres = [columna.key for columna in campos]
+    filas = [tuple(fila)[:len(campos)] for fila in filas]
+    if acepta_columnar(request):
+        return respuesta_columnar(nombres, filas)
+    return variar_por_accept(RespuestaJSON([dict(zip(nombres, fila)) for fila in filas]))
+
+def codificar_cursor(reporte):
+    """Genera un cursor opaco a partir de (created_at, id_reporte)"""
+    valor = f"{reporte.created_at.isoformat()}|{reporte.id_reporte}"
+    return base64.urlsafe_b64encode(valor.encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str):
+    """Obtiene (created_at, id_reporte) de un cursor generado por codificar_cursor"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valor = base64.urlsafe_b64decode(cursor + relleno).decode()
+        fecha, id_reporte = valor.rsplit("|", 1)
+        return datetime.fromisoformat(fecha), int(id_reporte)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+def campo_excedido(reporte: schemas.ReporteCreate):
+    """Primer campo de texto más largo que su columna en reportes, o None"""
+    for campo, valor in reporte.model_dump().items():
+        if isinstance(valor, str) and len(valor) > LONGITUDES_REPORTE.get(campo, len(valor)):
+            return campo
+    return None
+
+def antes_del_cursor(db: Session, fecha: datetime, id_reporte: int):
+    """Condición (created_at, id_reporte) < cursor.
+
+    SQLite guarda CURRENT_TIMESTAMP como texto 'YYYY-MM-DD HH:MM:SS' y un
+    datetime enlazado se escribe con microsegundos; se compara contra el
+    mismo texto que está guardado para no repetir las filas del mismo segundo.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        fecha = literal(fecha.isoformat(sep=" "), String)
+    return tuple_(models.Reporte.created_at, models.Reporte.id_reporte) < tuple_(fecha, id_reporte)
 
 @router.post("/", response_model=schemas.ReporteResponse, status_code=201)
 def crear_reporte(reporte: schemas.ReporteCreate, db: Session = Depends(get_db)):
     """Crear un nuevo reporte"""
     
     # Verificar que la categoría existe
-    categoria = db.query(models.Categoria).filter(models.Categoria.id_categoria == reporte.id_categoria).first()
-    if not categoria:
+    if not existe_categoria(db, reporte.id_categoria):
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     
     # Verificar que el estado existe
-    estado = db.query(models.Estado).filter(models.Estado.id_estado == reporte.id_estado).first()
-    if not estado:
+    if not existe_estado(db, reporte.id_estado):
         raise HTTPException(status_code=404, detail="Estado no encontrado")
     
+    # Marcar como duplicado si ya hay un reporte abierto del mismo incidente
+    duplicado_de = buscar_duplicado(
+        db,
+        reporte.id_categoria,
+        models.coordenada_numerica(reporte.latitud),
+        models.coordenada_numerica(reporte.longitud)
+    )
+    
     # Generar folio único
     folio = generar_folio()
     
     # Crear el reporte
     nuevo_reporte = models.Reporte(
         **reporte.dict(),
-        folio=folio
+        folio=folio,
+        duplicado_de=duplicado_de
     )
     
     db.add(nuevo_reporte)
+    estadisticas_diarias.sumar(db, reporte.id_categoria, reporte.id_estado)
+    versiones.incrementar(db, versiones.REPORTES)
     db.commit()
+    eventos.publicar_creados(db, {reporte.id_estado: 1})
     db.refresh(nuevo_reporte)
     return nuevo_reporte
 
+@router.post("/bulk", response_model=schemas.ReporteLoteResponse, status_code=201)
+def crear_reportes_lote(
+    reportes: List[schemas.ReporteCreate],
+    db: Session = Depends(get_db),
+    current_user: str = Depends(obtener_usuario_actual_db)
+):
+    """Crear varios reportes en una sola transacción.
+
+    Los reportes con categoría o estado inexistente, o con textos más largos
+    que su columna, se omiten y se informan en `resultados`; el resto se
+    inserta con una sola sentencia multi-fila.
+    """
+    if len(reportes) > MAX_REPORTES_LOTE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote excede el máximo de {MAX_REPORTES_LOTE} reportes"
+        )
+    
+    resultados = []
+    validos = []
+    
+    # Ids distintos del lote: a lo más una consulta por catálogo
+    categorias = categorias_existentes(db, {reporte.id_categoria for reporte in reportes})
+    estados = estados_existentes(db, {reporte.id_estado for reporte in reportes})
+    
+    for indice, reporte in enumerate(reportes):
+        excedido = campo_excedido(reporte)
+        if excedido:
+            resultados.append({
+                "indice": indice,
+                "ok": False,
+                "error": f"{excedido} excede {LONGITUDES_REPORTE[excedido]} caracteres"
+            })
+        elif reporte.id_categoria not in categorias:
+            resultados.append({"indice": indice, "ok": False, "error": "Categoría no encontrada"})
+        elif reporte.id_estado not in estados:
+            resultados.append({"indice": indice, "ok": False, "error": "Estado no encontrado"})
+        else:
+            resultados.append({"indice": indice, "ok": True})
+            validos.append((resultados[-1], reporte))
+    
+    filas = []
+    for (resultado, reporte), folio in zip(validos, generar_folios(len(validos))):
+        resultado["folio"] = folio
+        filas.append({
+            **reporte.dict(),
+            **models.columnas_coordenadas(reporte.latitud, reporte.longitud),
+            "folio": folio
+        })
+    
+    if filas:
+        try:
+            db.execute(insert(models.Reporte), filas)
+            por_clave = Counter((fila["id_categoria"], fila["id_estado"]) for fila in filas)
+            for (id_categoria, id_estado), cantidad in por_clave.items():
+                estadisticas_diarias.sumar(db, id_categoria, id_estado, cantidad)
+            versiones.incrementar(db, versiones.REPORTES)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="No se pudo registrar el lote, intente de nuevo")
+        except DBAPIError as e:
+            db.rollback()
+            raise HTTPException(status_code=422, detail={
+                "mensaje": "La base de datos rechazó el lote",
+                "error": type(e.orig).__name__
+            })
+        eventos.publicar_creados(db, Counter(fila["id_estado"] for fila in filas))
+    
+    return {
+        "total": len(reportes),
+        "creados": len(filas),
+        "fallidos": len(reportes) - len(filas),
+        "resultados": resultados
+    }
+
 @router.get("/", response_model=List[schemas.ReporteResponse])
 def listar_reportes(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
+    cursor: Optional[str] = None,
     id_categoria: int = None,
     id_estado: int = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Listar todos los reportes con filtros opcionales"""
-    query = db.query(models.Reporte)
+    """Listar todos los reportes con filtros opcionales.
+
+    Con `cursor` se pagina por (created_at, id_reporte) en lugar de `skip`,
+    de modo que cualquier página cuesta lo mismo que la primera. El cursor
+    de la siguiente página se devuelve en el encabezado `X-Next-Cursor`.
+    Con `Accept: application/vnd.sirse.columnar+json` se responde en formato
+    columnar con las columnas planas del reporte.
+    Con `fields=folio,id_estado,created_at` se consultan y devuelven solo
+    esas columnas planas, sin cargar categoría, estado ni multimedia.
+    """
+    variar_por_accept(response)
+    etag = etag_listado(request, db)
+    if etags.coincide(request, etag):
+        return variar_por_accept(etags.no_modificado(etag))
     
-    if id_categoria:
-        query = query.filter(models.Reporte.id_categoria == id_categoria)
+    columnar = acepta_columnar(request)
+    campos = parsear_campos(fields) if fields else None
+    if campos:
+        # created_at e id_reporte se leen siempre para poder generar el cursor
+        query = consultar_campos(db, campos, models.Reporte.created_at, models.Reporte.id_reporte)
+    elif columnar:
+        query = db.query(*COLUMNAS_REPORTE)
+    else:
+        query = db.query(models.Reporte).options(*CARGA_RELACIONES)
     
-    if id_estado:
-        query = query.filter(models.Reporte.id_estado == id_estado)
+    query = filtrar_reportes(query, id_categoria, id_estado)
+    query = query.order_by(models.Reporte.created_at.desc(), models.Reporte.id_reporte.desc())
+    
+    if cursor:
+        fecha, id_reporte = decodificar_cursor(cursor)
+        query = query.filter(antes_del_cursor(db, fecha, id_reporte))
+    else:
+        query = query.offset(skip)
+    
+    reportes = query.limit(limit).all()
     
-    reportes = query.order_by(models.Reporte.created_at.desc()).offset(skip).limit(limit).all()
-    return reportes
+    if campos:
+        response = respuesta_campos(request, campos, reportes)
+    elif columnar:
+        response = respuesta_columnar([c.key for c in COLUMNAS_REPORTE], reportes)
+    
+    response.headers["ETag"] = etag
+    if reportes and len(reportes) == limit:
+        response.headers["X-Next-Cursor"] = codificar_cursor(reportes[-1])
+    
+    return response if campos or columnar else reportes
 
-@router.get("/folio/{folio}", response_model=schemas.ReporteResponse)
-def obtener_reporte_por_folio(folio: str, db: Session = Depends(get_db)):
-    """Obtener un reporte por su folio"""
-    reporte = db.query(models.Reporte).filter(models.Reporte.folio == folio).first()
-    if not reporte:
+@router.get("/buscar", response_model=List[schemas.ReporteResponse])
+def buscar_reportes(
+    request: Request,
+    q: str = Query(..., min_length=2),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Buscar reportes por texto en descripción y dirección, ordenados por relevancia.
+
+    Acepta `fields` igual que listar_reportes.
+    """
+    campos = parsear_campos(fields) if fields else None
+    q = q.strip()
+    if not q:
+        return []  # solo espacios: no hay términos que buscar
+    ids = busqueda.buscar(db, q, skip, limit)
+    if not ids:
+        return []
+    
+    if campos:
+        query = consultar_campos(db, campos, models.Reporte.id_reporte)
+    else:
+        query = db.query(models.Reporte).options(*CARGA_RELACIONES)
+    
+    reportes = query.filter(models.Reporte.id_reporte.in_(ids)).all()
+    por_id = {reporte.id_reporte: reporte for reporte in reportes}
+    ordenados = [por_id[id_reporte] for id_reporte in ids if id_reporte in por_id]
+    return respuesta_campos(request, campos, ordenados) if campos else ordenados
+
+def _leer_exportacion(consulta):
+    """Recorre la consulta con un cursor del servidor en su propia sesión,
+    ya que el cuerpo se sigue generando después de que termina el handler"""
+    db = SessionLocal()
+    try:
+        resultado = db.execute(consulta.execution_options(yield_per=LOTE_EXPORTACION))
+        for fila in resultado:
+            yield fila
+    finally:
+        db.close()
+
+def _exportar_csv(filas, categorias, estados):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow([c.key for c in COLUMNAS_REPORTE] + ["categoria", "estado"])
+    
+    for numero, fila in enumerate(filas, 1):
+        escritor.writerow(list(fila) + [
+            categorias.get(fila.id_categoria, {}).get("nombre"),
+            estados.get(fila.id_estado, {}).get("nombre"),
+        ])
+        if numero % LOTE_EXPORTACION == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    yield buffer.getvalue()
+
+def _exportar_ndjson(filas, categorias, estados):
+    lineas = []
+    for fila in filas:
+        registro = dict(fila._mapping)
+        registro["categoria"] = categorias.get(fila.id_categoria, {}).get("nombre")
+        registro["estado"] = estados.get(fila.id_estado, {}).get("nombre")
+        lineas.append(json.dumps(registro, ensure_ascii=False, default=lambda v: v.isoformat()))
+        if len(lineas) == LOTE_EXPORTACION:
+            yield "\n".join(lineas) + "\n"
+            lineas = []
+    
+    if lineas:
+        yield "\n".join(lineas) + "\n"
+
+@router.get("/export")
+def exportar_reportes(
+    formato: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    id_categoria: int = None,
+    id_estado: int = None,
+    desde: Optional[datetime] = Query(None, alias="from"),
+    hasta: Optional[datetime] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: str = Depends(obtener_usuario_actual_db)
+):
+    """Exportar reportes en CSV o NDJSON sin cargar la tabla en memoria"""
+    consulta = filtrar_reportes(
+        select(*COLUMNAS_REPORTE), id_categoria, id_estado, desde, hasta
+    ).order_by(models.Reporte.id_reporte)
+    
+    filas = _leer_exportacion(consulta)
+    categorias = catalogos.categorias(db)
+    estados = catalogos.estados(db)
+    
+    if formato == "ndjson":
+        contenido = _exportar_ndjson(filas, categorias, estados)
+        media_type = "application/x-ndjson"
+    else:
+        contenido = _exportar_csv(filas, categorias, estados)
+        media_type = "text/csv; charset=utf-8"
+    
+    return StreamingResponse(
+        contenido,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reportes.{formato}"'}
+    )
+
+def etag_listado(request: Request, db: Session) -> str:
+    """ETag de un listado: cambia con cualquier escritura en reportes o catálogos"""
+    return etags.calcular_etag(
+        request.url.path,
+        versiones.obtener(db, versiones.REPORTES, versiones.CATALOGOS),
+        request.url.query,
+        request.headers.get("accept", "")
+    )
+
+def etag_reporte(id_reporte: int, version: int, version_catalogos) -> str:
+    return etags.calcular_etag("reporte", id_reporte, version, version_catalogos)
+
+def _no_modificado(request: Request, db: Session, condicion):
+    """304 si el cliente ya tiene la versión actual del reporte (leyendo solo
+    su versión, sin cargar ni serializar la fila); None si hay que enviarlo"""
+    if not request.headers.get("if-none-match"):
+        return None
+    fila = db.query(
+        models.Reporte.id_reporte,
+        models.Reporte.version,
+        versiones.subconsulta(versiones.CATALOGOS)
+    ).filter(condicion).first()
+    if not fila:
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
+    etag = etag_reporte(*fila)
+    return etags.no_modificado(etag) if etags.coincide(request, etag) else None
+
+def _consultar_reporte(db: Session, condicion):
+    """(reporte, ETag, versión de reportes) leídos en una sola consulta"""
+    fila = db.query(
+        models.Reporte,
+        versiones.subconsulta(versiones.CATALOGOS),
+        versiones.subconsulta(versiones.REPORTES)
+    ).options(*CARGA_RELACIONES).filter(condicion).first()
+    if not fila:
+        raise HTTPException(status_code=404, detail="Reporte no encontrado")
+    
+    reporte, version_catalogos, version_reportes = fila
+    etag = etag_reporte(reporte.id_reporte, reporte.version, version_catalogos)
+    return reporte, etag, version_reportes or 0
+
+def _leer_reporte(request: Request, response: Response, db: Session, condicion):
+    """Carga un reporte con su ETag, o responde 304 si el cliente ya lo tiene"""
+    no_modificado = _no_modificado(request, db, condicion)
+    if no_modificado:
+        return no_modificado
+    
+    reporte, etag, _ = _consultar_reporte(db, condicion)
+    response.headers["ETag"] = etag
     return reporte
 
+@router.get("/cache/folios")
+def estadisticas_cache_folios(current_user: str = Depends(obtener_usuario_actual_db)):
+    """Aciertos, fallos y ocupación de la caché de consultas por folio"""
+    return cache_folios.estadisticas()
+
+@router.get("/folio/{folio}", response_model=schemas.ReporteResponse)
+def obtener_reporte_por_folio(folio: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Obtener un reporte por su folio.
+
+    Es la consulta pública de seguimiento: la respuesta serializada se guarda
+    en cache_folios y los aciertos se sirven sin consultar la BD.
+    """
+    en_cache = cache_folios.obtener(folio)
+    if en_cache:
+        etag, cuerpo = en_cache
+        if etags.coincide(request, etag):
+            return etags.no_modificado(etag)
+        return Response(cuerpo, media_type="application/json", headers={"ETag": etag})
+    
+    condicion = models.Reporte.folio == folio
+    no_modificado = _no_modificado(request, db, condicion)
+    if no_modificado:
+        return no_modificado
+    
+    # La versión leída junto con la fila evita que una lectura previa a un
+    # cambio vuelva a guardar la copia vieja después de la invalidación
+    reporte, etag, version = _consultar_reporte(db, condicion)
+    cuerpo = schemas.ReporteResponse.model_validate(reporte).model_dump_json().encode("utf-8")
+    cache_folios.guardar(folio, etag, cuerpo, version)
+    return Response(cuerpo, media_type="application/json", headers={"ETag": etag})
+
 @router.get("/{reporte_id}", response_model=schemas.ReporteResponse)
-def obtener_reporte(reporte_id: int, db: Session = Depends(get_db)):
+def obtener_reporte(reporte_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Obtener un reporte por ID"""
-    reporte = db.query(models.Reporte).filter(models.Reporte.id_reporte == reporte_id).first()
-    if not reporte:
-        raise HTTPException(status_code=404, detail="Reporte no encontrado")
-    return reporte
+    return _leer_reporte(request, response, db, models.Reporte.id_reporte == reporte_id)
 
 @router.put("/{reporte_id}", response_model=schemas.ReporteResponse)
 def actualizar_reporte(reporte_id: int, reporte: schemas.ReporteUpdate, db: Session = Depends(get_db)):
@@ -89,21 +556,33 @@ def actualizar_reporte(reporte_id: int, reporte: schemas.ReporteUpdate, db: Sess
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
     
     # Verificar que la categoría existe si se está actualizando
-    if reporte.id_categoria:
-        categoria = db.query(models.Categoria).filter(models.Categoria.id_categoria == reporte.id_categoria).first()
-        if not categoria:
-            raise HTTPException(status_code=404, detail="Categoría no encontrada")
+    if reporte.id_categoria and not existe_categoria(db, reporte.id_categoria):
+        raise HTTPException(status_code=404, detail="Categoría no encontrada")
     
     # Verificar que el estado existe si se está actualizando
-    if reporte.id_estado:
-        estado = db.query(models.Estado).filter(models.Estado.id_estado == reporte.id_estado).first()
-        if not estado:
-            raise HTTPException(status_code=404, detail="Estado no encontrado")
+    if reporte.id_estado and not existe_estado(db, reporte.id_estado):
+        raise HTTPException(status_code=404, detail="Estado no encontrado")
     
-    for key, value in reporte.dict(exclude_unset=True).items():
+    anterior = (db_reporte.id_categoria, db_reporte.id_estado)
+    cambios = reporte.dict(exclude_unset=True)
+    for key, value in cambios.items():
         setattr(db_reporte, key, value)
+    db_reporte.version = models.Reporte.version + 1
     
+    estadisticas_diarias.mover(
+        db, db_reporte.created_at.date(), anterior, (db_reporte.id_categoria, db_reporte.id_estado)
+    )
+    if db_reporte.id_estado != anterior[1]:
+        transiciones.registrar(db, db_reporte, anterior[1])
+    versiones.incrementar(db, versiones.REPORTES)
     db.commit()
+    cache_folios.invalidar(db_reporte.folio, versiones.obtener(db, versiones.REPORTES)[0])
+    if db_reporte.id_estado != anterior[1]:
+        eventos.publicar_cambio_estado(db, anterior[1], db_reporte.id_estado)
+    else:
+        eventos.registrar_escritura()
+    if "latitud" in cambios or "longitud" in cambios:
+        motor_zonas.marcar_sucio()
     db.refresh(db_reporte)
     return db_reporte
 
@@ -114,23 +593,85 @@ def eliminar_reporte(reporte_id: int, db: Session = Depends(get_db)):
     if not reporte:
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
     
+    folio, id_estado, created_at = reporte.folio, reporte.id_estado, reporte.created_at
     db.delete(reporte)
+    estadisticas_diarias.sumar(
+        db, reporte.id_categoria, reporte.id_estado, cantidad=-1, dia=reporte.created_at.date()
+    )
+    versiones.incrementar(db, versiones.REPORTES)
     db.commit()
+    cache_folios.invalidar(folio, versiones.obtener(db, versiones.REPORTES)[0])
+    eventos.publicar_eliminado(db, id_estado, created_at)
+    motor_zonas.marcar_sucio()
     return {"message": "Reporte eliminado correctamente"}
 
 @router.get("/mapa/puntos", response_model=List[schemas.ReporteSimple])
-def obtener_puntos_mapa(id_categoria: int = None, id_estado: int = None, db: Session = Depends(get_db)):
-    """Obtener reportes para mostrar en el mapa (solo datos esenciales)"""
-    query = db.query(models.Reporte).filter(
-        models.Reporte.latitud.isnot(None),
-        models.Reporte.longitud.isnot(None)
-    )
+def obtener_puntos_mapa(
+    request: Request,
+    response: Response,
+    id_categoria: int = None,
+    id_estado: int = None,
+    bbox: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Obtener reportes para mostrar en el mapa (solo datos esenciales).
+
+    `bbox=minLon,minLat,maxLon,maxLat` limita los puntos al área visible.
+    Acepta el formato columnar igual que listar_reportes.
+    """
+    variar_por_accept(response)
+    etag = etag_listado(request, db)
+    if etags.coincide(request, etag):
+        return variar_por_accept(etags.no_modificado(etag))
     
-    if id_categoria:
-        query = query.filter(models.Reporte.id_categoria == id_categoria)
+    if acepta_columnar(request):
+        filas = _consultar_puntos(db.query(*COLUMNAS_MAPA), id_categoria, id_estado, bbox).all()
+        response = respuesta_columnar([c.key for c in COLUMNAS_MAPA], filas)
+        response.headers["ETag"] = etag
+        return response
     
-    if id_estado:
-        query = query.filter(models.Reporte.id_estado == id_estado)
+    response.headers["ETag"] = etag
+    return _consultar_puntos(db.query(models.Reporte), id_categoria, id_estado, bbox).all()
+
+def _consultar_puntos(query, id_categoria=None, id_estado=None, bbox=None):
+    return filtrar_reportes(filtrar_area(query, bbox), id_categoria, id_estado)
+
+@router.get("/mapa/clusters", response_model=schemas.ClustersMapaResponse)
+def obtener_clusters_mapa(
+    zoom: int = Query(..., ge=0, le=22),
+    bbox: Optional[str] = None,
+    id_categoria: int = None,
+    id_estado: int = None,
+    db: Session = Depends(get_db)
+):
+    """Agrupar los reportes del mapa según el zoom.
+
+    Por debajo de ZOOM_PUNTOS_INDIVIDUALES se devuelven celdas geohash con
+    total y centroide; a partir de ese zoom, los puntos individuales.
+    """
+    if zoom >= ZOOM_PUNTOS_INDIVIDUALES:
+        puntos = _consultar_puntos(db.query(models.Reporte), id_categoria, id_estado, bbox).all()
+        return {"zoom": zoom, "puntos": puntos}
+    
+    precision = next(p for zoom_maximo, p in PRECISION_POR_ZOOM if zoom <= zoom_maximo)
+    celda = func.substr(models.Reporte.geohash, 1, precision).label("celda")
+    
+    query = db.query(
+        celda,
+        func.count(models.Reporte.id_reporte).label("total"),
+        func.avg(models.Reporte.latitud_num).label("latitud"),
+        func.avg(models.Reporte.longitud_num).label("longitud")
+    ).filter(models.Reporte.geohash.isnot(None))
+    
+    query = filtrar_area(query, bbox)
+    query = filtrar_reportes(query, id_categoria, id_estado)
     
-    reportes = query.all()
-    return reportes
\ No newline at end of file
+    clusters = query.group_by(celda).all()
+    return {
+        "zoom": zoom,
+        "precision": precision,
+        "clusters": [
+            {"celda": c.celda, "total": c.total, "latitud": c.latitud, "longitud": c.longitud}
+            for c in clusters
+        ]
+    }
\ No newline at end of file
@@ -123,6 +123,7 @@ class ReporteResponse(ReporteBase):
     folio: str
     created_at: datetime
     updated_at: Optional[datetime] = None  # <-- Hacerlo opcional
+    duplicado_de: Optional[int] = None
     categoria: CategoriaResponse
     estado: EstadoResponse
     multimedia: List[MultimediaResponse] = []
@@ -130,6 +131,18 @@ class ReporteResponse(ReporteBase):
     class Config:
         from_attributes = True
 
+class ReporteLoteResultado(BaseModel):
+    indice: int
+    ok: bool
+    folio: Optional[str] = None
+    error: Optional[str] = None
+
+class ReporteLoteResponse(BaseModel):
+    total: int
+    creados: int
+    fallidos: int
+    resultados: List[ReporteLoteResultado]
+
 class ReporteSimple(BaseModel):
     id_reporte: int
     nombre: str
@@ -145,6 +158,18 @@ class ReporteSimple(BaseModel):
     class Config:
         from_attributes = True
 
+class ClusterMapa(BaseModel):
+    celda: str
+    total: int
+    latitud: float
+    longitud: float
+
+class ClustersMapaResponse(BaseModel):
+    zoom: int
+    precision: Optional[int] = None
+    clusters: List[ClusterMapa] = []
+    puntos: List[ReporteSimple] = []
+
 # ==================== SCHEMAS PARA AUTENTICACIÓN ====================
 
 # Schema para registro de usuario
@@ -4,7 +4,8 @@ Ejecutar con: python -m sirse_api.seed_data
 """
 from sqlalchemy.orm import Session
 from .database import SessionLocal, engine
-from .models import Categoria, Estado, Departamento, Base
+from .catalogos import MAPEO_DEPARTAMENTOS
+from .models import Categoria, CategoriaDepartamento, Estado, Departamento, Base
 from datetime import datetime
 
 def init_db():
@@ -177,6 +178,21 @@ def init_db():
         db.commit()
         print("✅ Departamentos creados correctamente")
         
+        # ============= ASIGNAR CATEGORÍAS A DEPARTAMENTOS =============
+        ids_categorias = {categoria.nombre: categoria.id_categoria for categoria in categorias}
+        asignaciones = [
+            CategoriaDepartamento(
+                id_departamento=depto.id_departamento,
+                id_categoria=ids_categorias[nombre]
+            )
+            for depto in departamentos
+            for nombre in MAPEO_DEPARTAMENTOS.get(depto.nombre, [])
+        ]
+        
+        db.add_all(asignaciones)
+        db.commit()
+        print("✅ Categorías asignadas a departamentos")
+        
         print("\n" + "="*50)
         print("🎉 BASE DE DATOS INICIALIZADA CORRECTAMENTE")
         print("="*50)
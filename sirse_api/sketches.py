@@ -0,0 +1,136 @@
+"""
+Sketches de cuantiles combinables (estilo DDSketch).
+
+Cada valor se cuenta en una cubeta logarítmica: el índice es
+ceil(log_gamma(valor)), con gamma = (1 + precision) / (1 - precision).
+Cualquier cuantil se estima con error relativo menor a `precision`, el
+tamaño depende del rango de valores y no de cuántos hay (~800 cubetas
+entre un minuto y diez años con 1 %), y dos sketches se combinan sumando
+sus cubetas.
+
+Se guardan como JSON en `sketches` con llave (ambito, clave), p. ej.
+("resolucion_categoria", "3") o ("resolucion_mes", "2026-10").
+"""
+import json
+import math
+
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+
+SKETCH_PRECISION = 0.01
+
+# Valores menores se cuentan como cero (el logaritmo no está definido en 0)
+SKETCH_MINIMO = 1e-6
+
+
+class SketchCuantiles:
+    def __init__(self, precision: float = SKETCH_PRECISION):
+        self.precision = precision
+        self.gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = math.log(self.gamma)
+        self.cuentas = {}  # índice de cubeta -> cuenta
+        self.ceros = 0
+        self.total = 0
+        self.suma = 0.0
+
+    def agregar(self, valor: float, cantidad: int = 1):
+        if valor < SKETCH_MINIMO:
+            self.ceros += cantidad
+        else:
+            indice = math.ceil(math.log(valor) / self._log_gamma)
+            self.cuentas[indice] = self.cuentas.get(indice, 0) + cantidad
+        self.total += cantidad
+        self.suma += valor * cantidad
+
+    def combinar(self, otro: "SketchCuantiles"):
+        """Agrega las cuentas de `otro` (misma precisión) a este sketch"""
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden combinar sketches con la misma precisión")
+        for indice, cuenta in otro.cuentas.items():
+            self.cuentas[indice] = self.cuentas.get(indice, 0) + cuenta
+        self.ceros += otro.ceros
+        self.total += otro.total
+        self.suma += otro.suma
+        return self
+
+    def cuantil(self, q: float):
+        """Valor aproximado del cuantil q (0..1), o None si el sketch está vacío"""
+        if not self.total:
+            return None
+        rango = q * (self.total - 1)
+        acumulado = self.ceros
+        if rango < acumulado:
+            return 0.0
+        for indice in sorted(self.cuentas):
+            acumulado += self.cuentas[indice]
+            if acumulado > rango:
+                # Punto de la cubeta (gamma^(i-1), gamma^i] con menor error relativo
+                return 2 * self.gamma ** indice / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.cuentas) / (self.gamma + 1)
+
+    def promedio(self):
+        return self.suma / self.total if self.total else None
+
+    def a_json(self) -> str:
+        return json.dumps({
+            "precision": self.precision,
+            "cuentas": {str(indice): cuenta for indice, cuenta in self.cuentas.items()},
+            "ceros": self.ceros,
+            "total": self.total,
+            "suma": self.suma,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def desde_json(cls, texto: str) -> "SketchCuantiles":
+        datos = json.loads(texto)
+        sketch = cls(datos["precision"])
+        sketch.cuentas = {int(indice): cuenta for indice, cuenta in datos["cuentas"].items()}
+        sketch.ceros = datos["ceros"]
+        sketch.total = datos["total"]
+        sketch.suma = datos["suma"]
+        return sketch
+
+
+# ========= PERSISTENCIA =========
+
+def agregar(db, ambito: str, clave: str, valor: float):
+    """Agrega `valor` al sketch (ambito, clave) dentro de la transacción de `db`"""
+    tabla = models.Sketch
+    fila = db.query(tabla).filter(
+        tabla.ambito == ambito, tabla.clave == clave
+    ).with_for_update().first()
+
+    if fila is None:
+        sketch = SketchCuantiles()
+        sketch.agregar(valor)
+        try:
+            with db.begin_nested():
+                db.add(tabla(ambito=ambito, clave=clave, datos=sketch.a_json()))
+            return
+        except IntegrityError:
+            # Otro proceso lo creó primero: actualizar el suyo
+            fila = db.query(tabla).filter(
+                tabla.ambito == ambito, tabla.clave == clave
+            ).with_for_update().one()
+
+    sketch = SketchCuantiles.desde_json(fila.datos)
+    sketch.agregar(valor)
+    fila.datos = sketch.a_json()
+
+
+def cargar(db, ambito: str) -> dict:
+    """{clave: SketchCuantiles} de todos los sketches de `ambito`"""
+    return {
+        clave: SketchCuantiles.desde_json(datos)
+        for clave, datos in db.query(models.Sketch.clave, models.Sketch.datos).filter(
+            models.Sketch.ambito == ambito
+        )
+    }
+
+
+def combinados(sketches) -> SketchCuantiles:
+    resultado = SketchCuantiles()
+    for sketch in sketches:
+        resultado.combinar(sketch)
+    return resultado
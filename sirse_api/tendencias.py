@@ -0,0 +1,98 @@
+"""
+Series de tiempo de reportes por día, semana o mes.
+
+La agrupación se hace en SQL sobre `reporte_stats_daily.dia` (primera
+columna de su llave primaria) con la expresión de cada motor, al estilo
+date_trunc. Los periodos sin reportes no vienen en el resultado; se
+rellenan con ceros en una sola pasada de NumPy.
+"""
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Date, cast, func
+
+from . import models
+
+GRANULARIDADES = ("day", "week", "month")
+
+# Unidad de numpy con la que se alinea el inicio de cada periodo
+UNIDADES = {"day": "D", "week": "D", "month": "M"}
+
+# Máximo de periodos por consulta (p. ej. ~3 años por día)
+TENDENCIAS_MAX_PERIODOS = 1100
+
+
+def expresion_periodo(motor: str, granularidad: str, columna):
+    """Fecha de inicio del periodo (lunes para semanas, día 1 para meses) que contiene `columna`"""
+    if granularidad == "day":
+        return columna
+
+    if motor == "postgresql":
+        return cast(func.date_trunc(granularidad, columna), Date)
+
+    if motor == "mysql":
+        if granularidad == "week":
+            return func.subdate(columna, func.weekday(columna))
+        return func.date_format(columna, "%Y-%m-01")
+
+    # SQLite: 'weekday 0' avanza al domingo; 6 días antes es el lunes
+    if granularidad == "week":
+        return func.date(columna, "weekday 0", "-6 days")
+    return func.date(columna, "start of month")
+
+
+def _a_dias(fechas) -> np.ndarray:
+    """Convierte fechas (date, datetime o 'YYYY-MM-DD') a datetime64[D]"""
+    return np.array([str(fecha)[:10] for fecha in fechas], dtype="datetime64[D]")
+
+
+def _lunes(dias: np.ndarray) -> np.ndarray:
+    # El 1970-01-01 fue jueves: (días + 3) % 7 es 0 en lunes
+    return dias - (dias.astype(np.int64) + 3) % 7
+
+
+def periodos(desde: date, hasta: date, granularidad: str) -> np.ndarray:
+    """Inicio de cada periodo que toca el rango semiabierto [desde, hasta)"""
+    inicio, fin = _a_dias([desde, hasta])
+    if granularidad == "week":
+        return np.arange(_lunes(inicio), fin, 7)
+    unidad = UNIDADES[granularidad]
+    return np.arange(inicio.astype(f"datetime64[{unidad}]"), (fin - 1).astype(f"datetime64[{unidad}]") + 1)
+
+
+def rellenar(inicios: np.ndarray, claves: list, filas) -> np.ndarray:
+    """Matriz len(claves) x len(inicios) con los totales de `filas` (periodo, clave, total)
+    y ceros en los periodos sin reportes"""
+    matriz = np.zeros((len(claves), len(inicios)), dtype=np.int64)
+    if not filas:
+        return matriz
+
+    fechas, claves_filas, totales = zip(*filas)
+    posiciones = np.searchsorted(inicios, _a_dias(fechas).astype(inicios.dtype))
+    indice_clave = {clave: i for i, clave in enumerate(claves)}
+    filas_matriz = np.array([indice_clave[clave] for clave in claves_filas])
+    np.add.at(matriz, (filas_matriz, posiciones), np.array(totales, dtype=np.int64))
+    return matriz
+
+
+def calcular(db, desde: date, hasta: date, granularidad: str, id_categoria=None, id_estado=None):
+    """(inicios de periodo, ids de categoría, matriz categoría x periodo) en [desde, hasta)"""
+    diario = models.ReporteStatsDaily
+    inicios = periodos(desde, hasta, granularidad)
+
+    periodo = expresion_periodo(db.get_bind().dialect.name, granularidad, diario.dia).label("periodo")
+    query = db.query(periodo, diario.id_categoria, func.sum(diario.total)).filter(
+        diario.dia >= desde, diario.dia < hasta
+    )
+    if id_categoria:
+        query = query.filter(diario.id_categoria == id_categoria)
+    if id_estado:
+        query = query.filter(diario.id_estado == id_estado)
+
+    filas = [
+        (fecha, categoria, int(total))
+        for fecha, categoria, total in query.group_by(periodo, diario.id_categoria)
+        if total
+    ]
+    claves = sorted({categoria for _, categoria, _ in filas})
+    return inicios, claves, rellenar(inicios, claves, filas)
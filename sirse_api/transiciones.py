@@ -0,0 +1,51 @@
+"""
+Historial de estados y tiempos de resolución.
+
+Cada cambio de estado de un reporte se guarda en `reporte_transiciones`.
+Cuando el reporte pasa a "Resuelto", las horas desde su creación se
+agregan a los sketches de su categoría y del mes de resolución, así que
+p50/p90/p99 se responden sin recorrer el historial.
+"""
+from sqlalchemy import func, select
+
+from . import models, sketches
+from .catalogos import ESTADO_RESUELTO, ids_estados
+
+RESOLUCION_CATEGORIA = "resolucion_categoria"
+RESOLUCION_MES = "resolucion_mes"
+
+CUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def registrar(db, reporte, id_estado_anterior):
+    """Registra el cambio de estado de `reporte` en la transacción de `db`"""
+    # Hora de la BD, la misma referencia que created_at (sin zona, como esa columna)
+    ahora = db.scalar(select(func.now())).replace(tzinfo=None)
+    db.add(models.ReporteTransicion(
+        id_reporte=reporte.id_reporte,
+        id_estado_anterior=id_estado_anterior,
+        id_estado_nuevo=reporte.id_estado,
+        created_at=ahora
+    ))
+
+    if reporte.id_estado in ids_estados(db, [ESTADO_RESUELTO]) and reporte.created_at:
+        horas = max((ahora - reporte.created_at).total_seconds() / 3600, 0)
+        sketches.agregar(db, RESOLUCION_CATEGORIA, str(reporte.id_categoria), horas)
+        sketches.agregar(db, RESOLUCION_MES, f"{ahora:%Y-%m}", horas)
+
+
+def resumen(sketch) -> dict:
+    """Total, promedio y cuantiles (en horas) de un sketch"""
+    datos = {"total": sketch.total, "promedio": _redondear(sketch.promedio())}
+    for nombre, q in CUANTILES.items():
+        datos[nombre] = _redondear(sketch.cuantil(q))
+    return datos
+
+
+def mediana_global(db):
+    """Mediana en horas de todos los tiempos de resolución, o None si no hay"""
+    return _redondear(sketches.combinados(sketches.cargar(db, RESOLUCION_CATEGORIA).values()).cuantil(0.5))
+
+
+def _redondear(valor):
+    return round(valor, 1) if valor is not None else None
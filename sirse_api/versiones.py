@@ -0,0 +1,43 @@
+"""
+Versiones por tabla compartidas entre procesos.
+
+Cada escritura sobre reportes (o sobre los catálogos que se anidan en sus
+respuestas) incrementa un contador en `versiones_tablas` dentro de la misma
+transacción. Leer la versión es una consulta por llave primaria, mucho más
+barata que recalcular el listado para saber si cambió.
+"""
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+
+REPORTES = "reportes"
+CATALOGOS = "catalogos"
+
+
+def incrementar(db, nombre: str):
+    """Incrementa la versión de `nombre` en la transacción de `db`"""
+    tabla = models.VersionTabla.__table__
+    sentencia = update(tabla).where(tabla.c.nombre == nombre).values(version=tabla.c.version + 1)
+
+    if db.execute(sentencia).rowcount == 0:
+        try:
+            with db.begin_nested():
+                db.execute(insert(tabla).values(nombre=nombre, version=1))
+        except IntegrityError:
+            db.execute(sentencia)
+
+
+def subconsulta(nombre: str):
+    """Versión de `nombre` como subconsulta escalar, para combinarla con otra lectura"""
+    return select(models.VersionTabla.version).where(
+        models.VersionTabla.nombre == nombre
+    ).scalar_subquery()
+
+
+def obtener(db, *nombres) -> tuple:
+    """Versiones actuales en el orden pedido (0 si la tabla nunca se ha escrito)"""
+    versiones = dict(db.query(models.VersionTabla.nombre, models.VersionTabla.version).filter(
+        models.VersionTabla.nombre.in_(nombres)
+    ).all())
+    return tuple(versiones.get(nombre, 0) for nombre in nombres)
@@ -0,0 +1,156 @@
+"""
+Detección de zonas calientes por densidad de reportes.
+
+Las coordenadas se cargan una vez en arreglos de NumPy y después solo se
+agregan los reportes nuevos (id_reporte mayor al último cargado). Los puntos
+se agrupan en una rejilla de CELDA_METROS; una celda es zona caliente si
+ninguna de sus 8 vecinas tiene más reportes, y su total y centroide son los
+de su vecindario 3x3. Todo el cálculo es vectorizado.
+"""
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from . import models
+
+ZONAS_CELDA_METROS = float(os.getenv("ZONAS_CELDA_METROS", "250"))
+ZONAS_MINIMO_REPORTES = int(os.getenv("ZONAS_MINIMO_REPORTES", "2"))
+ZONAS_REFRESCO = int(os.getenv("ZONAS_REFRESCO", "60"))            # segundos entre cargas incrementales
+ZONAS_RECARGA_TOTAL = int(os.getenv("ZONAS_RECARGA_TOTAL", "900"))  # segundos entre recargas completas
+
+METROS_POR_GRADO = 111_320.0
+# Llave de celda = x * DESPLAZAMIENTO + (y + DESPLAZAMIENTO // 2); cabe de sobra en int64
+DESPLAZAMIENTO = 2 ** 21
+VECINOS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+class MotorZonasCalientes:
+    def __init__(self, celda_metros: float = ZONAS_CELDA_METROS, minimo: int = ZONAS_MINIMO_REPORTES):
+        self.celda_metros = celda_metros
+        self.minimo = minimo
+        self._lock = threading.Lock()
+        self._ids = np.empty(0, dtype=np.int64)
+        self._lat = np.empty(0)
+        self._lon = np.empty(0)
+        self._ultimo_id = 0
+        self._sucio = True
+        self._ultima_carga = 0.0
+        self._ultima_recarga = 0.0
+        self.zonas_calculadas = []
+
+    def marcar_sucio(self):
+        """Forzar recarga completa (reportes eliminados o con coordenadas editadas)"""
+        self._sucio = True
+
+    def _cargar(self, db, desde_id: int):
+        filas = db.query(
+            models.Reporte.id_reporte,
+            models.Reporte.latitud_num,
+            models.Reporte.longitud_num
+        ).filter(
+            models.Reporte.id_reporte > desde_id,
+            models.Reporte.latitud_num.isnot(None),
+            models.Reporte.longitud_num.isnot(None)
+        ).order_by(models.Reporte.id_reporte).all()
+
+        if not filas:
+            return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+        datos = np.array(filas, dtype=np.float64)
+        return datos[:, 0].astype(np.int64), datos[:, 1], datos[:, 2]
+
+    def actualizar(self, db):
+        """Carga los reportes nuevos (o todos, si hace falta) y recalcula las zonas"""
+        with self._lock:
+            ahora = time.monotonic()
+            recarga_total = self._sucio or ahora - self._ultima_recarga > ZONAS_RECARGA_TOTAL
+            if not recarga_total and ahora - self._ultima_carga < ZONAS_REFRESCO:
+                return self.zonas_calculadas
+
+            if recarga_total:
+                self._sucio = False
+                self._ids, self._lat, self._lon = self._cargar(db, 0)
+                self._ultima_recarga = ahora
+            else:
+                ids, lat, lon = self._cargar(db, self._ultimo_id)
+                self._ids = np.concatenate([self._ids, ids])
+                self._lat = np.concatenate([self._lat, lat])
+                self._lon = np.concatenate([self._lon, lon])
+
+            if len(self._ids):
+                self._ultimo_id = int(self._ids.max())
+            self._ultima_carga = ahora
+            self.zonas_calculadas = self._calcular(db)
+            return self.zonas_calculadas
+
+    def zonas(self, db, limit: int = 10) -> list:
+        return self.actualizar(db)[:limit]
+
+    def _calcular(self, db) -> list:
+        ids, lat, lon = self._ids, self._lat, self._lon
+        if len(ids) == 0:
+            return []
+
+        # Proyección equirectangular local: suficiente a escala de ciudad
+        escala_lon = math.cos(math.radians(float(np.median(lat))))
+        x = np.floor(lon * METROS_POR_GRADO * escala_lon / self.celda_metros).astype(np.int64)
+        y = np.floor(lat * METROS_POR_GRADO / self.celda_metros).astype(np.int64)
+        claves = x * DESPLAZAMIENTO + (y + DESPLAZAMIENTO // 2)
+
+        celdas, inversa, conteos = np.unique(claves, return_inverse=True, return_counts=True)
+        suma_lat = np.bincount(inversa, weights=lat)
+        suma_lon = np.bincount(inversa, weights=lon)
+
+        total = np.zeros(len(celdas), dtype=np.int64)
+        vec_lat = np.zeros(len(celdas))
+        vec_lon = np.zeros(len(celdas))
+        es_maximo = np.ones(len(celdas), dtype=bool)
+
+        for dx, dy in VECINOS:
+            vecinas = celdas + dx * DESPLAZAMIENTO + dy
+            posicion = np.minimum(np.searchsorted(celdas, vecinas), len(celdas) - 1)
+            existe = celdas[posicion] == vecinas
+            conteo = np.where(existe, conteos[posicion], 0)
+
+            total += conteo
+            vec_lat += np.where(existe, suma_lat[posicion], 0)
+            vec_lon += np.where(existe, suma_lon[posicion], 0)
+            if (dx, dy) != (0, 0):
+                # Empates: gana la celda con la llave mayor para no duplicar la zona
+                mayor = (conteo > conteos) | (existe & (conteo == conteos) & (vecinas > celdas))
+                es_maximo &= ~mayor
+
+        es_maximo &= total >= self.minimo
+        centro_lat = vec_lat / np.maximum(total, 1)
+        centro_lon = vec_lon / np.maximum(total, 1)
+
+        # Reporte más cercano al centroide de cada zona, para mostrar una dirección
+        puntos = np.flatnonzero(es_maximo[inversa])
+        celda_punto = inversa[puntos]
+        distancia = (lat[puntos] - centro_lat[celda_punto]) ** 2 + \
+            ((lon[puntos] - centro_lon[celda_punto]) * escala_lon) ** 2
+        orden = np.lexsort((distancia, celda_punto))
+        primero = np.r_[True, celda_punto[orden][1:] != celda_punto[orden][:-1]]
+        representante = dict(zip(celda_punto[orden][primero].tolist(), ids[puntos[orden][primero]].tolist()))
+
+        direcciones = dict(db.query(models.Reporte.id_reporte, models.Reporte.direccion).filter(
+            models.Reporte.id_reporte.in_(list(representante.values()))
+        ).all()) if representante else {}
+
+        indices = np.flatnonzero(es_maximo)
+        indices = indices[np.argsort(-total[indices], kind="stable")]
+        return [
+            {
+                "direccion": direcciones.get(representante.get(i)),
+                "total": int(total[i]),
+                "latitud": round(float(centro_lat[i]), 6),
+                "longitud": round(float(centro_lon[i]), 6),
+                "radio_m": round(self.celda_metros * 1.5),
+            }
+            for i in indices.tolist()
+        ]
+
+
+motor_zonas = MotorZonasCalientes()
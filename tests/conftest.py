@@ -0,0 +1,115 @@
+"""
+Configuración común de las pruebas.
+
+La API corre contra una base SQLite temporal (create_all + índice FTS5, como
+en desarrollo local). Si POSTGRES_URL está definida se guarda en
+POSTGRES_URL_PRUEBAS para las pruebas que solo aplican a PostgreSQL.
+"""
+import os
+import tempfile
+
+import pytest
+
+POSTGRES_URL_PRUEBAS = os.getenv("POSTGRES_URL")
+
+os.environ["POSTGRES_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sirse_"), "pruebas.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from sirse_api import models  # noqa: E402
+from sirse_api.cache_folios import cache_folios  # noqa: E402
+from sirse_api.cache_resultados import cache_estadisticas  # noqa: E402
+from sirse_api.catalogos import catalogos  # noqa: E402
+from sirse_api.database import Base, SessionLocal, engine  # noqa: E402
+from sirse_api.main import app  # noqa: E402
+from sirse_api.routers.auth import obtener_usuario_actual_db  # noqa: E402
+
+# El panel montado en "/" atraparía las rutas de la API en el cliente de pruebas
+app.router.routes = [ruta for ruta in app.router.routes if getattr(ruta, "name", "") != "static"]
+
+ESTADOS = ["Pendiente", "En proceso", "Resuelto", "Rechazado", "Cerrado"]
+CATEGORIAS = ["Baches", "Basura", "Alumbrado público"]
+
+
+@pytest.fixture(autouse=True)
+def bd_limpia():
+    """Cada prueba empieza con las tablas vacías y los cachés del proceso limpios"""
+    with engine.begin() as conn:
+        for tabla in reversed(Base.metadata.sorted_tables):
+            conn.execute(tabla.delete())
+    catalogos.invalidar()
+    cache_estadisticas.limpiar()
+    cache_folios.limpiar()
+    yield
+
+
+@pytest.fixture
+def db():
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+
+
+@pytest.fixture
+def cliente():
+    app.dependency_overrides[obtener_usuario_actual_db] = lambda: "pruebas@sirse.mx"
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def catalogo(db):
+    """Estados y categorías base: {nombre: id}"""
+    estados = [models.Estado(nombre=nombre, activo=True) for nombre in ESTADOS]
+    categorias = [models.Categoria(nombre=nombre, estado=True) for nombre in CATEGORIAS]
+    db.add_all(estados + categorias)
+    db.commit()
+    return {
+        **{estado.nombre: estado.id_estado for estado in estados},
+        **{categoria.nombre: categoria.id_categoria for categoria in categorias},
+    }
+
+
+@pytest.fixture
+def crear_reportes(cliente, catalogo):
+    """Crea `cantidad` reportes con /reportes/bulk y regresa sus folios"""
+    def crear(cantidad, categoria="Baches", estado="Pendiente", **campos):
+        lote = [
+            {
+                "nombre": "Ana",
+                "apellido_paterno": "López",
+                "apellido_materno": "Ruiz",
+                "descripcion": f"Reporte de prueba {i}",
+                "latitud": f"20.{i:04d}",
+                "longitud": f"-98.{i:04d}",
+                "direccion": f"Calle {i}",
+                "id_categoria": catalogo[categoria],
+                "id_estado": catalogo[estado],
+                **campos,
+            }
+            for i in range(cantidad)
+        ]
+        respuesta = cliente.post("/api/reportes/bulk", json=lote)
+        assert respuesta.status_code == 201, respuesta.text
+        return [resultado["folio"] for resultado in respuesta.json()["resultados"]]
+    return crear
+
+
+@pytest.fixture
+def consultas():
+    """Sentencias SQL ejecutadas mientras la prueba está activa"""
+    registradas = []
+
+    def registrar(conn, cursor, sentencia, parametros, contexto, multiples):
+        registradas.append(sentencia)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield registradas
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
@@ -0,0 +1,19 @@
+"""Búsqueda de texto en GET /api/reportes/buscar"""
+
+
+def test_busqueda_por_texto(cliente, crear_reportes):
+    crear_reportes(3, descripcion="Poste caído en la esquina")
+
+    respuesta = cliente.get("/api/reportes/buscar", params={"q": "poste"})
+
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == 3
+
+
+def test_consulta_solo_con_espacios(cliente, crear_reportes):
+    crear_reportes(1)
+
+    respuesta = cliente.get("/api/reportes/buscar", params={"q": "   "})
+
+    assert respuesta.status_code == 200
+    assert respuesta.json() == []
@@ -0,0 +1,40 @@
+"""Caché de /reportes/folio/{folio}"""
+import pytest
+
+from sirse_api import models
+from sirse_api.cache_folios import AlmacenMemoria, AlmacenSQLite, CacheFolios, cache_folios
+from sirse_api.routers.reportes import _consultar_reporte
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memoria":
+        return CacheFolios(AlmacenMemoria(10))
+    return CacheFolios(AlmacenSQLite(10, str(tmp_path / "cache.db")))
+
+
+def test_lectura_tardia_no_reemplaza_la_invalidacion(cache):
+    cache.guardar("F1", "v1", b"{}", 1)
+    cache.invalidar("F1", 2)
+
+    cache.guardar("F1", "v1", b"{}", 1)  # lectura que cargó la fila antes del cambio
+    assert cache.obtener("F1") is None
+
+    cache.guardar("F1", "v2", b"{}", 2)
+    assert cache.obtener("F1") == ("v2", b"{}")
+
+
+def test_folio_no_regresa_al_estado_anterior(cliente, crear_reportes, catalogo, db):
+    folio, = crear_reportes(1)
+    assert cliente.get(f"/api/reportes/folio/{folio}").json()["id_estado"] == catalogo["Pendiente"]
+
+    # Una lectura carga la fila y pierde la carrera contra la actualización
+    cache_folios.limpiar()
+    reporte, etag, version = _consultar_reporte(db, models.Reporte.folio == folio)
+    viejo = b'{"id_estado": %d}' % reporte.id_estado
+
+    respuesta = cliente.put(f"/api/reportes/{reporte.id_reporte}", json={"id_estado": catalogo["Resuelto"]})
+    assert respuesta.status_code == 200
+    cache_folios.guardar(folio, etag, viejo, version)
+
+    assert cliente.get(f"/api/reportes/folio/{folio}").json()["id_estado"] == catalogo["Resuelto"]
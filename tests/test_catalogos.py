@@ -0,0 +1,35 @@
+"""Validación de categoría y estado contra la copia en memoria de los catálogos"""
+from sirse_api import models
+from sirse_api.catalogos import catalogos
+
+
+def test_categoria_creada_en_otro_proceso(cliente, crear_reportes, db):
+    crear_reportes(1)  # la copia de catálogos ya está cargada
+
+    # Escritura directa en la BD, sin pasar por este proceso ni invalidar la copia
+    nueva = models.Categoria(nombre="Fuga de agua", estado=True)
+    db.add(nueva)
+    db.commit()
+    assert nueva.id_categoria not in catalogos.categorias(db)
+
+    respuesta = cliente.post("/api/reportes/", json={
+        "nombre": "Ana",
+        "apellido_paterno": "López",
+        "apellido_materno": "Ruiz",
+        "direccion": "Calle 1",
+        "id_categoria": nueva.id_categoria,
+    })
+
+    assert respuesta.status_code == 201, respuesta.text
+    assert nueva.id_categoria in catalogos.categorias(db)
+
+
+def test_categoria_inexistente(cliente, catalogo):
+    respuesta = cliente.post("/api/reportes/", json={
+        "nombre": "Ana",
+        "apellido_paterno": "López",
+        "apellido_materno": "Ruiz",
+        "id_categoria": 999,
+    })
+
+    assert respuesta.status_code == 404
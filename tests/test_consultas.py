@@ -0,0 +1,27 @@
+"""
+Número fijo de consultas por petición: una relación cargada por reporte
+(N+1) hace crecer la cuenta con el número de filas y falla aquí.
+"""
+import pytest
+
+from sirse_api.cache_resultados import cache_estadisticas
+
+CONSULTAS_POR_RUTA = {
+    "/api/reportes/": 3,
+    "/api/reportes/mapa/puntos": 2,
+    "/api/estadisticas/recientes": 2,
+}
+
+
+@pytest.mark.parametrize("ruta, esperadas", CONSULTAS_POR_RUTA.items())
+def test_consultas_constantes(cliente, crear_reportes, consultas, ruta, esperadas):
+    for cantidad in (2, 20):
+        crear_reportes(cantidad)
+        cliente.get(ruta)  # calienta el caché de catálogos
+        cache_estadisticas.limpiar()
+
+        consultas.clear()
+        respuesta = cliente.get(ruta)
+
+        assert respuesta.status_code == 200
+        assert len(consultas) == esperadas, consultas
@@ -0,0 +1,13 @@
+"""GET /api/estadisticas/dashboard"""
+
+
+def test_dashboard_sin_errores(cliente, crear_reportes):
+    crear_reportes(3)
+
+    respuesta = cliente.get("/api/estadisticas/dashboard")
+
+    assert respuesta.status_code == 200
+    datos = respuesta.json()
+    assert datos["errores"] == {}
+    assert datos["generales"]["total_reportes"] == 3
+    assert sum(datos["por_mes_chart"]["values"]) == 3
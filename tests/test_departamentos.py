@@ -0,0 +1,37 @@
+"""GET /api/estadisticas/rendimiento-departamentos"""
+from sirse_api import models
+from sirse_api.catalogos import MAPEO_DEPARTAMENTOS
+
+
+def test_rendimiento_por_departamento(cliente, crear_reportes, catalogo, db):
+    departamentos = {
+        nombre: models.Departamento(nombre=nombre, activo=True)
+        for nombre in [*MAPEO_DEPARTAMENTOS, "Parques y Jardines"]
+    }
+    db.add_all(departamentos.values())
+    db.flush()
+    db.add_all(
+        models.CategoriaDepartamento(
+            id_departamento=departamentos[depto].id_departamento, id_categoria=catalogo[categoria]
+        )
+        for depto, categorias in MAPEO_DEPARTAMENTOS.items()
+        for categoria in categorias
+        if categoria in catalogo
+    )
+    db.commit()
+    crear_reportes(3, categoria="Basura")
+    crear_reportes(1, categoria="Basura", estado="Resuelto")
+
+    por_nombre = {
+        fila["departamento"]: fila
+        for fila in cliente.get("/api/estadisticas/rendimiento-departamentos").json()
+    }
+
+    assert por_nombre["Servicios Municipales"] == {
+        "departamento": "Servicios Municipales",
+        "reportes_atendidos": 4,
+        "reportes_resueltos": 1,
+        "reportes_abiertos": 3,
+        "eficiencia": 25.0,
+    }
+    assert por_nombre["Parques y Jardines"]["eficiencia"] is None
@@ -0,0 +1,34 @@
+"""Detección de duplicados al crear reportes"""
+import time
+
+import pytest
+from sqlalchemy import func, update
+
+from sirse_api import models
+from sirse_api.duplicados import buscar_duplicado
+
+
+@pytest.fixture
+def zona_horaria(monkeypatch):
+    """Cambia la zona horaria local del proceso (la BD de pruebas sigue en UTC)"""
+    def cambiar(zona):
+        monkeypatch.setenv("TZ", zona)
+        time.tzset()
+    yield cambiar
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("zona, horas, es_duplicado", [
+    ("Etc/GMT+6", 28, False),  # UTC-6: fuera de la ventana de 24 h
+    ("Etc/GMT-9", 20, True),   # UTC+9: dentro de la ventana
+])
+def test_ventana_usa_el_reloj_de_la_bd(crear_reportes, catalogo, db, zona_horaria, zona, horas, es_duplicado):
+    crear_reportes(1, latitud="20.5", longitud="-98.5")
+    db.execute(update(models.Reporte).values(created_at=func.datetime("now", f"-{horas} hours")))
+    db.commit()
+
+    zona_horaria(zona)
+    original = buscar_duplicado(db, catalogo["Baches"], 20.5, -98.5)
+
+    assert (original is not None) == es_duplicado
@@ -0,0 +1,13 @@
+"""Caché de resultados de /api/estadisticas"""
+
+
+def test_generales_y_avanzadas_comparten_el_resumen(cliente, crear_reportes, consultas):
+    crear_reportes(3)
+
+    consultas.clear()
+    generales = cliente.get("/api/estadisticas/generales").json()
+    avanzadas = cliente.get("/api/estadisticas/metricas-avanzadas").json()
+
+    assert generales["total_reportes"] == 3
+    assert avanzadas["reportes_mes_actual"] == 3
+    assert sum("count(CASE" in sentencia for sentencia in consultas) == 1
@@ -0,0 +1,18 @@
+"""ETag de /reportes/{id} y /reportes/folio/{folio}"""
+from sirse_api import models
+
+
+def test_cambio_en_el_mismo_segundo_cambia_el_etag(cliente, crear_reportes, catalogo, db):
+    folio, = crear_reportes(1)
+    id_reporte = db.query(models.Reporte.id_reporte).filter(models.Reporte.folio == folio).scalar()
+
+    etags_vistos = []
+    for estado in ("En proceso", "Resuelto"):
+        respuesta = cliente.get(f"/api/reportes/{id_reporte}")
+        etags_vistos.append(respuesta.headers["ETag"])
+        cliente.put(f"/api/reportes/{id_reporte}", json={"id_estado": catalogo[estado]})
+
+        for ruta in (f"/api/reportes/{id_reporte}", f"/api/reportes/folio/{folio}"):
+            respuesta = cliente.get(ruta, headers={"If-None-Match": etags_vistos[-1]})
+            assert respuesta.status_code == 200
+            assert respuesta.json()["id_estado"] == catalogo[estado]
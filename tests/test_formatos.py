@@ -0,0 +1,18 @@
+"""Negociación JSON / columnar con Accept"""
+import pytest
+
+from sirse_api.formatos import MEDIA_TYPE_COLUMNAR
+
+
+@pytest.mark.parametrize("ruta", ["/api/reportes/", "/api/reportes/mapa/puntos"])
+@pytest.mark.parametrize("accept", ["application/json", MEDIA_TYPE_COLUMNAR])
+def test_vary_accept_en_todas_las_respuestas(cliente, crear_reportes, ruta, accept):
+    crear_reportes(2)
+
+    respuesta = cliente.get(ruta, headers={"Accept": accept})
+    assert respuesta.status_code == 200
+    assert "Accept" in respuesta.headers["Vary"].split(", ")
+
+    no_modificado = cliente.get(ruta, headers={"Accept": accept, "If-None-Match": respuesta.headers["ETag"]})
+    assert no_modificado.status_code == 304
+    assert "Accept" in no_modificado.headers["Vary"].split(", ")
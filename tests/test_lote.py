@@ -0,0 +1,51 @@
+"""Carga por lotes en POST /api/reportes/bulk"""
+from sirse_api.catalogos import catalogos
+
+
+def _reporte(catalogo, **campos):
+    return {
+        "nombre": "Ana",
+        "apellido_paterno": "López",
+        "apellido_materno": "Ruiz",
+        "direccion": "Calle 1",
+        "id_categoria": catalogo["Baches"],
+        "id_estado": catalogo["Pendiente"],
+        **campos,
+    }
+
+
+def test_textos_largos_se_reportan_por_elemento(cliente, catalogo):
+    lote = [
+        _reporte(catalogo),
+        _reporte(catalogo, nombre="A" * 101),
+        _reporte(catalogo, descripcion="x" * 501),
+        _reporte(catalogo, id_categoria=999),
+    ]
+
+    respuesta = cliente.post("/api/reportes/bulk", json=lote)
+
+    assert respuesta.status_code == 201, respuesta.text
+    datos = respuesta.json()
+    assert (datos["creados"], datos["fallidos"]) == (1, 3)
+    errores = [resultado["error"] for resultado in datos["resultados"]]
+    assert errores == [
+        None,
+        "nombre excede 100 caracteres",
+        "descripcion excede 500 caracteres",
+        "Categoría no encontrada",
+    ]
+
+
+def test_ids_inexistentes_se_validan_en_una_consulta_por_catalogo(cliente, catalogo, consultas, db):
+    lote = [
+        _reporte(catalogo, id_categoria=1000 + i) if i % 2 else _reporte(catalogo, id_estado=999)
+        for i in range(300)
+    ]
+    catalogos.categorias(db), catalogos.estados(db)  # copia ya cargada
+
+    consultas.clear()
+    respuesta = cliente.post("/api/reportes/bulk", json=lote)
+
+    assert respuesta.status_code == 201, respuesta.text
+    assert respuesta.json()["fallidos"] == 300
+    assert len(consultas) == 2, consultas
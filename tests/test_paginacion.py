@@ -0,0 +1,21 @@
+"""Paginación por cursor de GET /api/reportes/"""
+
+
+def test_cursor_recorre_filas_del_mismo_segundo(cliente, crear_reportes):
+    # El lote se inserta en una sola sentencia: todas las filas comparten created_at
+    crear_reportes(7)
+
+    vistos = []
+    cursor = None
+    for _ in range(10):
+        parametros = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        respuesta = cliente.get("/api/reportes/", params=parametros)
+        assert respuesta.status_code == 200
+        vistos += [reporte["id_reporte"] for reporte in respuesta.json()]
+        cursor = respuesta.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert cursor is None
+    assert len(vistos) == 7
+    assert vistos == sorted(set(vistos), reverse=True)
@@ -0,0 +1,106 @@
+"""
+Planes de ejecución: los filtros por rango deben recorrer un índice.
+
+- Rango de fechas de /estadisticas/por-mes sobre la llave primaria de
+  reporte_stats_daily (dia, ...).
+- Cursor de /reportes/ sobre ix_reportes_created_at_id.
+
+SQLite siempre; PostgreSQL solo si POSTGRES_URL apunta a una BD de pruebas.
+"""
+from contextlib import contextmanager
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from conftest import POSTGRES_URL_PRUEBAS
+from sirse_api import models
+from sirse_api.database import Base, engine
+from sirse_api.routers.estadisticas import _totales_por_mes
+from sirse_api.routers.reportes import antes_del_cursor
+
+
+@contextmanager
+def capturar(motor, fragmento):
+    """Sentencias (sql, parámetros) enviadas a `motor` que contienen `fragmento`"""
+    capturadas = []
+
+    def registrar(conn, cursor, sentencia, parametros, contexto, multiples):
+        if fragmento in sentencia:
+            capturadas.append((sentencia, parametros))
+
+    event.listen(motor, "before_cursor_execute", registrar)
+    try:
+        yield capturadas
+    finally:
+        event.remove(motor, "before_cursor_execute", registrar)
+
+
+def _plan(conn, sentencia, parametros, prefijo):
+    return "\n".join(str(fila[-1]) for fila in conn.exec_driver_sql(prefijo + sentencia, parametros))
+
+
+# ========= SQLITE =========
+
+def test_sqlite_rango_por_mes_usa_llave_de_dia(cliente, crear_reportes):
+    crear_reportes(3)
+
+    with capturar(engine, "reporte_stats_daily") as capturadas:
+        respuesta = cliente.get("/api/estadisticas/por-mes", params={"from": "2026-01-01", "to": "2026-07-01"})
+    assert respuesta.status_code == 200
+
+    with engine.connect() as conn:
+        plan = _plan(conn, *capturadas[-1], "EXPLAIN QUERY PLAN ")
+    assert "SEARCH reporte_stats_daily USING INDEX" in plan
+    assert "(dia>? AND dia<?)" in plan
+
+
+def test_sqlite_cursor_usa_indice_de_paginacion(cliente, crear_reportes):
+    crear_reportes(5)
+    cursor = cliente.get("/api/reportes/", params={"limit": 2}).headers["X-Next-Cursor"]
+
+    with capturar(engine, "FROM reportes") as capturadas:
+        cliente.get("/api/reportes/", params={"limit": 2, "cursor": cursor})
+
+    with engine.connect() as conn:
+        plan = _plan(conn, *capturadas[-1], "EXPLAIN QUERY PLAN ")
+    assert "SEARCH reportes USING INDEX ix_reportes_created_at_id" in plan
+
+
+# ========= POSTGRESQL =========
+
+@pytest.fixture(scope="module")
+def sesion_postgres():
+    if not POSTGRES_URL_PRUEBAS:
+        pytest.skip("POSTGRES_URL no está definida")
+    motor = create_engine(POSTGRES_URL_PRUEBAS)
+    Base.metadata.create_all(bind=motor)
+    with Session(motor) as sesion:
+        # Con tablas chicas el planificador prefiere recorrerlas completas;
+        # sin esa opción el plan muestra si el índice sirve para el rango
+        sesion.execute(text("SET enable_seqscan = off"))
+        yield sesion
+        sesion.rollback()
+    motor.dispose()
+
+
+def test_postgres_rango_por_mes_usa_llave_de_dia(sesion_postgres):
+    with capturar(sesion_postgres.get_bind(), "reporte_stats_daily") as capturadas:
+        _totales_por_mes(sesion_postgres, date(2026, 1, 1), date(2026, 7, 1))
+
+    plan = _plan(sesion_postgres.connection(), *capturadas[-1], "EXPLAIN ")
+    assert "Index" in plan and "reporte_stats_daily_pkey" in plan
+
+
+def test_postgres_cursor_usa_indice_de_paginacion(sesion_postgres):
+    reporte = models.Reporte
+    consulta = sesion_postgres.query(reporte.id_reporte).filter(
+        antes_del_cursor(sesion_postgres, datetime(2026, 10, 1), 100)
+    ).order_by(reporte.created_at.desc(), reporte.id_reporte.desc()).limit(20)
+
+    with capturar(sesion_postgres.get_bind(), "FROM reportes") as capturadas:
+        consulta.all()
+
+    plan = _plan(sesion_postgres.connection(), *capturadas[-1], "EXPLAIN ")
+    assert "Index" in plan and "ix_reportes_created_at_id" in plan
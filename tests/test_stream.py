@@ -0,0 +1,71 @@
+"""Vigilante de versiones de /estadisticas/stream"""
+import asyncio
+import time
+from datetime import timedelta
+
+from fastapi.concurrency import run_in_threadpool
+
+from sirse_api import models, versiones
+from sirse_api.database import SessionLocal
+from sirse_api.eventos import difusor
+from sirse_api.routers import estadisticas
+from sirse_api.routers.auth import crear_access_token
+
+
+def _escritura_de_otro_proceso():
+    db = SessionLocal()
+    try:
+        versiones.incrementar(db, versiones.REPORTES)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_vigilante_solo_envia_fotos_por_escrituras_ajenas(crear_reportes, monkeypatch):
+    monkeypatch.setattr(estadisticas, "SSE_INTERVALO", 0.01)
+    publicados = []
+    monkeypatch.setattr(difusor, "publicar", lambda tipo, datos: publicados.append(tipo))
+
+    async def escenario():
+        with difusor.suscribir():
+            vigilante = asyncio.create_task(estadisticas._vigilar_versiones())
+            await asyncio.sleep(0.05)
+
+            await run_in_threadpool(crear_reportes, 2)
+            await asyncio.sleep(0.05)
+            assert publicados == ["delta"]
+
+            await run_in_threadpool(_escritura_de_otro_proceso)
+            await asyncio.sleep(0.05)
+            assert publicados == ["delta", "metricas"]
+        await asyncio.wait_for(vigilante, 1)
+
+    asyncio.run(escenario())
+
+
+def _usuario(db):
+    db.add(models.Usuario(nombre="Ana", email="ana@sirse.mx", contraseña="x"))
+    db.commit()
+
+
+def test_stream_rechaza_token_vencido_o_de_usuario_inexistente(cliente, db):
+    _usuario(db)
+    vencido = crear_access_token({"sub": "ana@sirse.mx"}, timedelta(seconds=-1))
+    sin_usuario = crear_access_token({"sub": "nadie@sirse.mx"})
+
+    for token in (vencido, sin_usuario):
+        respuesta = cliente.get("/api/estadisticas/stream", params={"token": token})
+        assert respuesta.status_code == 401
+
+
+def test_stream_se_cierra_al_vencer_el_token(cliente, catalogo, db):
+    _usuario(db)
+    token = crear_access_token({"sub": "ana@sirse.mx"}, timedelta(seconds=2))
+
+    inicio = time.monotonic()
+    with cliente.stream("GET", "/api/estadisticas/stream", params={"token": token}) as respuesta:
+        assert respuesta.status_code == 200
+        eventos = [linea for linea in respuesta.iter_lines() if linea.startswith("event:")]
+
+    assert eventos == ["event: metricas"]
+    assert time.monotonic() - inicio < 5